@@ -0,0 +1,32 @@
+"""add_task_agents_agent_id_index
+
+Revision ID: 9fc81cb00ee0
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 13:00:00.000000
+
+task_agents is keyed on (task_id, agent_id), so the primary key cannot serve
+lookups by agent_id alone. Listing an agent's tasks filters the join table on
+agent_id, which scans it without this index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '9fc81cb00ee0'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_task_agents_agent_id "
+            "ON task_agents (agent_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_task_agents_agent_id")
@@ -572,7 +572,7 @@ class PostgresCRUDRepository(CRUDRepository[T], Generic[M, T, Relationships]):
         if relationships:
             query = query.options(*self._get_query_options(relationships))
 
-        results = await session.execute(query)
+        results = await session.scalars(query)
         if results is None:
             if ids is not None:
                 error_message = f"Item with id '{ids}' does not exist."
@@ -91,6 +91,12 @@ class TaskAgentORM(BaseORM):
     agent_id = Column(String, ForeignKey("agents.id"), primary_key=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # The primary key leads with task_id, so listing an agent's tasks
+        # needs its own index on agent_id
+        Index("ix_task_agents_agent_id", "agent_id"),
+    )
+
 
 class EventORM(BaseORM):
     __tablename__ = "events"
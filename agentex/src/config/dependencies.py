@@ -18,7 +18,7 @@ from sqlalchemy.ext.asyncio import (
 from temporalio.client import Client as TemporalClient
 
 from src.config.environment_variables import Environment, EnvironmentVariables
-from src.utils.database import async_db_engine_creator
+from src.utils.database import async_db_engine_creator, json_serializer
 from src.utils.db_metrics import (
     InstrumentedAsyncAdaptedQueuePool,
     PostgresMetricsCollector,
@@ -100,6 +100,7 @@ class GlobalDependencies(metaclass=Singleton):
                 self.environment_variables.DATABASE_URL,
             ),
             echo=echo_db_engine,
+            json_serializer=json_serializer,
             poolclass=InstrumentedAsyncAdaptedQueuePool,  # emits pool wait_time/pending_requests/timeouts
             pool_size=async_db_pool_size,
             max_overflow=20,  # Allow 20 additional connections beyond pool_size when needed
@@ -113,6 +114,7 @@ class GlobalDependencies(metaclass=Singleton):
                 self.environment_variables.DATABASE_URL,
             ),
             echo=echo_db_engine,
+            json_serializer=json_serializer,
             poolclass=InstrumentedAsyncAdaptedQueuePool,  # emits pool wait_time/pending_requests/timeouts
             pool_size=middleware_db_pool_size,
             max_overflow=10,  # Allow 10 additional connections for middleware
@@ -193,6 +195,7 @@ class GlobalDependencies(metaclass=Singleton):
                 "postgresql+asyncpg://",
                 async_creator=async_db_engine_creator(read_only_db_url),
                 echo=echo_db_engine,
+                json_serializer=json_serializer,
                 poolclass=InstrumentedAsyncAdaptedQueuePool,  # emits pool wait_time/pending_requests/timeouts
                 pool_size=async_db_pool_size,
                 max_overflow=20,
@@ -1,12 +1,15 @@
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy import update
+from sqlalchemy import exists, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 from src.adapters.crud_store.adapter_postgres import (
     PostgresCRUDRepository,
     async_sql_exception_handler,
 )
+from src.adapters.crud_store.exceptions import ItemDoesNotExist
 from src.adapters.orm import AgentTaskTrackerORM, EventORM
 from src.config.dependencies import (
     DDatabaseAsyncReadOnlySessionMaker,
@@ -33,6 +36,34 @@ class AgentTaskTrackerRepository(
             AgentTaskTrackerEntity,
         )
 
+    async def get_by_agent_task(
+        self, agent_id: str, task_id: str
+    ) -> AgentTaskTrackerEntity:
+        """
+        Get the tracker for an agent-task combination with a single-row query
+        on idx_agent_task_tracker_agent_task.
+
+        Raises:
+            ItemDoesNotExist: If no tracker exists for the combination
+        """
+        async with (
+            self.start_async_db_session(allow_writes=False) as session,
+            async_sql_exception_handler(),
+        ):
+            result = await session.scalar(
+                select(AgentTaskTrackerORM)
+                .where(
+                    AgentTaskTrackerORM.agent_id == agent_id,
+                    AgentTaskTrackerORM.task_id == task_id,
+                )
+                .limit(1)
+            )
+            if result is None:
+                raise ItemDoesNotExist(
+                    f"Tracker for agent '{agent_id}' and task '{task_id}' does not exist."
+                )
+            return AgentTaskTrackerEntity.model_validate(result)
+
     async def update_agent_task_tracker(
         self,
         id: str,
@@ -41,7 +72,11 @@ class AgentTaskTrackerRepository(
         last_processed_event_id: str | None = None,
     ) -> AgentTaskTrackerEntity:
         """
-        Commit cursor position for an agent-task combination using SELECT FOR UPDATE.
+        Commit cursor position for an agent-task combination.
+
+        The cursor validation and the update run as a single conditional UPDATE,
+        which also takes the row lock. Only when no row is updated is a follow-up
+        SELECT issued to work out which check failed.
 
         Args:
             id: The tracker ID
@@ -54,73 +89,83 @@ class AgentTaskTrackerRepository(
 
         Raises:
             ItemDoesNotExist: If processing state doesn't exist
-            ValueError: If cursor moves backwards
+            ValueError: If the event doesn't exist or the cursor moves backwards
         """
         async with (
             self.start_async_db_session(True) as session,
             async_sql_exception_handler(),
         ):
-            # Lock the row for update
-            result = await session.execute(
-                select(AgentTaskTrackerORM)
-                .where(
-                    AgentTaskTrackerORM.id == id,
-                )
-                .with_for_update()
-            )
-            current = result.scalar_one()
+            values = {"status": status, "status_reason": status_reason}
+            stmt = update(AgentTaskTrackerORM).where(AgentTaskTrackerORM.id == id)
 
             # Only validate and update cursor if provided
             if last_processed_event_id is not None:
-                # Get the sequence ID of the new event
-                new_event_query = select(EventORM.sequence_id).where(
-                    EventORM.id == last_processed_event_id
-                )
-                new_event_result = await session.execute(new_event_query)
-                new_sequence_id = new_event_result.scalar_one_or_none()
-
-                if new_sequence_id is None:
-                    raise ValueError(
-                        f"Event with ID {last_processed_event_id} not found"
-                    )
-
-                # Get the sequence ID of the current last processed event
-                if current.last_processed_event_id is not None:
-                    current_event_query = select(EventORM.sequence_id).where(
-                        EventORM.id == current.last_processed_event_id
-                    )
-                    current_event_result = await session.execute(current_event_query)
-                    current_sequence_id = current_event_result.scalar_one_or_none()
-
-                    if (
-                        current_sequence_id is not None
-                        and new_sequence_id < current_sequence_id
-                    ):
-                        raise ValueError(
-                            f"Cannot move cursor backwards: new sequence ID {new_sequence_id} < current sequence ID {current_sequence_id}"
+                new_event = aliased(EventORM)
+                current_event = aliased(EventORM)
+                # The new event must exist and must not sit before the current
+                # cursor. A current cursor whose event is gone does not block.
+                stmt = stmt.where(
+                    exists()
+                    .where(new_event.id == last_processed_event_id)
+                    .where(
+                        ~exists()
+                        .where(
+                            current_event.id
+                            == AgentTaskTrackerORM.last_processed_event_id
                         )
+                        .where(new_event.sequence_id < current_event.sequence_id)
+                    )
+                )
+                values["last_processed_event_id"] = last_processed_event_id
 
-                # Update the cursor
-                current.last_processed_event_id = last_processed_event_id
-
-            # Always update status fields
-            current.status = status
-            current.status_reason = status_reason
             # updated_at will be set automatically by onupdate=func.now()
+            result = await session.execute(
+                stmt.values(**values).returning(AgentTaskTrackerORM)
+            )
+            updated = result.scalar_one_or_none()
 
-            # Flush to trigger the onupdate and get the updated timestamp
-            await session.flush()
-
-            # Refresh the object to get the updated timestamp
-            await session.refresh(current)
+            if updated is None:
+                await self._raise_for_rejected_update(
+                    session, id, last_processed_event_id
+                )
 
             # Create the entity while the session is still active
-            result = AgentTaskTrackerEntity.model_validate(current)
+            result = AgentTaskTrackerEntity.model_validate(updated)
 
             await session.commit()
 
             return result
 
+    @staticmethod
+    async def _raise_for_rejected_update(
+        session: AsyncSession, id: str, last_processed_event_id: str | None
+    ) -> None:
+        """Explain why the conditional tracker UPDATE matched no row."""
+        new_sequence_id = (
+            select(EventORM.sequence_id)
+            .where(EventORM.id == last_processed_event_id)
+            .scalar_subquery()
+        )
+        current_sequence_id = (
+            select(EventORM.sequence_id)
+            .where(EventORM.id == AgentTaskTrackerORM.last_processed_event_id)
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            select(new_sequence_id, current_sequence_id).where(
+                AgentTaskTrackerORM.id == id
+            )
+        )
+        # Raises NoResultFound (ItemDoesNotExist) if the tracker doesn't exist
+        new_sequence_id, current_sequence_id = result.one()
+
+        if new_sequence_id is None:
+            raise ValueError(f"Event with ID {last_processed_event_id} not found")
+
+        raise ValueError(
+            f"Cannot move cursor backwards: new sequence ID {new_sequence_id} < current sequence ID {current_sequence_id}"
+        )
+
     async def reset_cursors_for_task(self, task_id: str) -> int:
         """
         Reset last_processed_event_id to NULL for every tracker tied to a
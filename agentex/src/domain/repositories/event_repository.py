@@ -1,7 +1,8 @@
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Literal
 
 from fastapi import Depends
-from sqlalchemy import and_, delete
+from sqlalchemy import Select, and_, bindparam, delete, exists, func
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.future import select
 from src.adapters.crud_store.adapter_postgres import (
@@ -20,6 +21,47 @@ from src.utils.logging import make_logger
 logger = make_logger(__name__)
 
 
+@lru_cache
+def _events_after_query(
+    cursor: Literal["sequence_id", "event_id"] | None, limited: bool
+) -> Select:
+    """
+    Build the list_events_after_last_processed statement for one combination of
+    filters, with every value as a bound parameter. There are only six shapes,
+    so each is constructed once and reused; the engine's compiled cache then
+    recognises the same statement on every call.
+    """
+    query = select(EventORM).where(
+        and_(
+            EventORM.task_id == bindparam("task_id"),
+            EventORM.agent_id == bindparam("agent_id"),
+        )
+    )
+
+    # Add sequence filter after the cursor
+    if cursor == "sequence_id":
+        query = query.where(EventORM.sequence_id > bindparam("last_sequence_id"))
+    elif cursor == "event_id":
+        # An unknown event ID does not filter anything out. Sequence IDs
+        # start at 1, so coalescing to 0 keeps every event.
+        last_sequence_id_subquery = (
+            select(EventORM.sequence_id)
+            .where(EventORM.id == bindparam("last_processed_event_id"))
+            .scalar_subquery()
+        )
+        query = query.where(
+            EventORM.sequence_id > func.coalesce(last_sequence_id_subquery, 0)
+        )
+
+    # Order by sequence ID for consistent ordering
+    query = query.order_by(EventORM.sequence_id)
+
+    if limited:
+        query = query.limit(bindparam("limit"))
+
+    return query
+
+
 class EventRepository(PostgresCRUDRepository[EventORM, EventEntity]):
     def __init__(
         self,
@@ -61,56 +103,117 @@ class EventRepository(PostgresCRUDRepository[EventORM, EventEntity]):
             await session.commit()
             return self.entity.model_validate(orm)
 
+    async def create_many(
+        self,
+        task_id: str,
+        agent_id: str,
+        events: list[tuple[str, TaskMessageContentEntity | None]],
+    ) -> list[EventEntity]:
+        """
+        Create several events for one task and agent with a single multi-row
+        INSERT ... RETURNING, in one round-trip and one transaction.
+
+        Args:
+            task_id: The task ID the events belong to
+            agent_id: The agent ID the events belong to
+            events: (event ID, content) pairs, in the order they should be sequenced
+
+        Returns:
+            The created events ordered by sequence_id
+        """
+        if not events:
+            return []
+
+        async with (
+            self.start_async_db_session(True) as session,
+            async_sql_exception_handler(),
+        ):
+            stmt = (
+                insert(EventORM)
+                .values(
+                    [
+                        {
+                            "id": id,
+                            "task_id": task_id,
+                            "agent_id": agent_id,
+                            "content": content.model_dump(mode="json")
+                            if content
+                            else None,
+                        }
+                        for id, content in events
+                    ]
+                )
+                .returning(EventORM)
+            )
+
+            result = await session.execute(stmt)
+            orms = result.scalars().all()
+            await session.commit()
+            # RETURNING does not guarantee row order, so sort by sequence_id
+            return sorted(
+                (self.entity.model_validate(orm) for orm in orms),
+                key=lambda event: event.sequence_id,
+            )
+
+    async def exists(self, id: str) -> bool:
+        """Check whether an event exists without loading the row."""
+        async with self.start_async_db_session(allow_writes=False) as session:
+            return bool(await session.scalar(select(exists().where(EventORM.id == id))))
+
+    async def exists_many(self, ids: list[str]) -> set[str]:
+        """Return the subset of the given event IDs that exist, fetching only IDs."""
+        if not ids:
+            return set()
+
+        async with self.start_async_db_session(allow_writes=False) as session:
+            result = await session.scalars(
+                select(EventORM.id).where(EventORM.id.in_(ids))
+            )
+            return set(result)
+
     async def list_events_after_last_processed(
         self,
         task_id: str,
         agent_id: str,
         last_processed_event_id: str | None = None,
         limit: int | None = None,
+        last_sequence_id: int | None = None,
     ) -> list[EventEntity]:
         """
         List events for a specific task and agent, optionally filtering for events
-        after a specific event ID.
+        after a specific event ID or sequence ID.
+
+        Callers that already know the cursor's sequence ID should pass
+        last_sequence_id, which makes this a plain keyset scan on
+        idx_events_agent_task_order. An event ID is resolved to its sequence ID
+        by a subquery in the same statement.
 
         Args:
             task_id: The task ID to filter by
             agent_id: The agent ID to filter by
             last_processed_event_id: Optional event ID to filter events after
             limit: Optional limit on number of results
+            last_sequence_id: Optional sequence ID to filter events after; takes
+                precedence over last_processed_event_id
 
         Returns:
             List of Event objects ordered by sequence_id
         """
-        async with self.start_async_db_session(allow_writes=False) as session:
-            # If last_processed_event_id is provided, first find its sequence_id
-            last_sequence_id = None
-            if last_processed_event_id is not None:
-                sequence_query = select(EventORM.sequence_id).where(
-                    EventORM.id == last_processed_event_id
-                )
-                result = await session.execute(sequence_query)
-                last_sequence_id = result.scalar_one_or_none()
-
-            # Build the query with filters
-            query = select(EventORM).where(
-                and_(
-                    EventORM.task_id == task_id,
-                    EventORM.agent_id == agent_id,
-                )
-            )
-
-            # Add sequence filter if we found a sequence_id
-            if last_sequence_id is not None:
-                query = query.where(EventORM.sequence_id > last_sequence_id)
+        params = {"task_id": task_id, "agent_id": agent_id}
+        cursor = None
+        if last_sequence_id is not None:
+            cursor = "sequence_id"
+            params["last_sequence_id"] = last_sequence_id
+        elif last_processed_event_id is not None:
+            cursor = "event_id"
+            params["last_processed_event_id"] = last_processed_event_id
+        if limit is not None:
+            params["limit"] = limit
+
+        query = _events_after_query(cursor, limit is not None)
 
-            # Order by sequence ID for consistent ordering
-            query = query.order_by(EventORM.sequence_id)
-
-            # Add limit if provided
-            if limit is not None:
-                query = query.limit(limit)
-
-            result = await session.execute(query)
+        async with self.start_async_db_session(allow_writes=False) as session:
+            result = await session.execute(query, params)
             event_orms = result.scalars().all()
 
             return [EventEntity.model_validate(orm) for orm in event_orms]
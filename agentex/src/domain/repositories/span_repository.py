@@ -2,13 +2,18 @@ from typing import Annotated, Any
 
 from fastapi import Depends
 from sqlalchemy import or_, select
-from src.adapters.crud_store.adapter_postgres import PostgresCRUDRepository
+from sqlalchemy.dialects.postgresql import insert
+from src.adapters.crud_store.adapter_postgres import (
+    PostgresCRUDRepository,
+    async_sql_exception_handler,
+)
 from src.adapters.orm import SpanORM
 from src.config.dependencies import (
     DDatabaseAsyncReadOnlySessionMaker,
     DDatabaseAsyncReadWriteSessionMaker,
 )
 from src.domain.entities.spans import SpanEntity
+from src.utils.database import json_serializer
 from src.utils.logging import make_logger
 
 logger = make_logger(__name__)
@@ -27,6 +32,68 @@ class SpanRepository(PostgresCRUDRepository[SpanORM, SpanEntity]):
             SpanEntity,
         )
 
+    async def create(self, item: SpanEntity) -> SpanEntity:
+        """
+        Create a span with INSERT ... RETURNING. Unlike the base create(), None
+        input, output and data are bound rather than omitted, so they are stored
+        as JSON 'null' as update() and create_many() store them.
+        """
+        columns = SpanORM.__table__.columns
+        async with (
+            self.start_async_db_session(True) as session,
+            async_sql_exception_handler(),
+        ):
+            values = {
+                k: v
+                for k, v in item.to_dict().items()
+                if v is not None or columns[k].type.should_evaluate_none
+            }
+            result = await session.execute(
+                insert(SpanORM).values(**values).returning(*columns)
+            )
+            row = result.one()
+            await session.commit()
+            return SpanEntity.model_validate(dict(row._mapping))
+
+    async def create_many(self, spans: list[SpanEntity]) -> list[SpanEntity]:
+        """
+        Bulk insert spans with COPY on the underlying asyncpg connection.
+
+        COPY skips per-row parse and bind entirely, which makes it the fastest
+        way to ingest large traces. JSON fields are serialized up front since
+        COPY bypasses the column types; a None one is written as JSON 'null',
+        as create() stores it, not as SQL NULL. Unlike create(), rows are not
+        read back; the given spans are returned as written.
+        """
+        if not spans:
+            return []
+
+        columns = [column.name for column in SpanORM.__table__.columns]
+        # JSON columns that bind None as JSON 'null' rather than SQL NULL
+        json_columns = [
+            column.name
+            for column in SpanORM.__table__.columns
+            if column.type.should_evaluate_none
+        ]
+        records = []
+        for span in spans:
+            row = {column: getattr(span, column) for column in columns}
+            for column in json_columns:
+                row[column] = json_serializer(row[column])
+            records.append(tuple(row[column] for column in columns))
+
+        async with (
+            self.start_async_db_session(True) as session,
+            async_sql_exception_handler(),
+        ):
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                SpanORM.__tablename__, records=records, columns=columns
+            )
+            await session.commit()
+        return spans
+
     async def list(
         self,
         filters: dict[str, Any] | None = None,
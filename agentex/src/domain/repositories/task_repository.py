@@ -4,7 +4,7 @@ from typing import Annotated, Literal
 
 from fastapi import Depends
 from sqlalchemy import cast, distinct, func, select, update
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.orm import selectinload
 from src.adapters.crud_store.adapter_postgres import (
     ColumnPrimitiveValue,
@@ -196,6 +196,55 @@ class TaskRepository(PostgresCRUDRepository[TaskORM, TaskEntity, TaskRelationshi
             # Return with agents populated
             return TaskEntity.model_validate(orm)
 
+    async def create_many(
+        self, agent_id: str, tasks: list[TaskEntity]
+    ) -> list[TaskEntity]:
+        """
+        Create several tasks for one agent, with their agent relationships and
+        trackers, using one multi-row INSERT per table in a single transaction.
+
+        Args:
+            agent_id: The agent ID the tasks belong to
+            tasks: The tasks to create
+
+        Returns:
+            The created tasks, in the order given
+        """
+        if not tasks:
+            return []
+
+        async with (
+            self.start_async_db_session(True) as session,
+            async_sql_exception_handler(),
+        ):
+            # Drop None values, as create() does, so server defaults (e.g.,
+            # created_at) apply; JSON columns keep them and store JSON 'null'.
+            # The ORM bulk INSERT groups rows that share the same keys
+            columns = TaskORM.__table__.columns
+            result = await session.execute(
+                insert(TaskORM).returning(*columns, sort_by_parameter_order=True),
+                [
+                    {
+                        k: v
+                        for k, v in task.to_dict().items()
+                        if v is not None or columns[k].type.should_evaluate_none
+                    }
+                    for task in tasks
+                ],
+            )
+            created = [TaskEntity.model_validate(dict(row._mapping)) for row in result]
+
+            await session.execute(
+                insert(TaskAgentORM),
+                [{"task_id": task.id, "agent_id": agent_id} for task in created],
+            )
+            await session.execute(
+                insert(AgentTaskTrackerORM),
+                [{"task_id": task.id, "agent_id": agent_id} for task in created],
+            )
+            await session.commit()
+            return created
+
     async def update(self, task: TaskEntity) -> TaskEntity:
         """Update task, preserving agent relationships"""
 
@@ -12,14 +12,26 @@ from src.domain.services.task_message_service import DTaskMessageService
 
 
 def _flatten_to_dot_notation(obj: dict[str, Any], prefix: str = "") -> dict[str, Any]:
-    """Flatten nested dict to dot notation for MongoDB queries."""
+    """
+    Flatten nested dict to dot notation for MongoDB queries.
+
+    Walks the dict with an explicit stack of item iterators, writing every leaf
+    into one result dict, so keys keep their depth-first order without a
+    recursive call and intermediate dict per nesting level.
+    """
     result: dict[str, Any] = {}
-    for key, value in obj.items():
-        full_key = f"{prefix}.{key}" if prefix else key
-        if isinstance(value, dict):
-            result.update(_flatten_to_dot_notation(value, full_key))
-        else:
+    stack = [(prefix, iter(obj.items()))]
+    while stack:
+        current_prefix, items = stack[-1]
+        for key, value in items:
+            full_key = f"{current_prefix}.{key}" if current_prefix else key
+            if isinstance(value, dict):
+                # Descend now; this level resumes after the nested dict is done
+                stack.append((full_key, iter(value.items())))
+                break
             result[full_key] = value
+        else:
+            stack.pop()
     return result
 
 
@@ -1,6 +1,9 @@
+import json
+from typing import Any
 from urllib.parse import urlparse
 
 import asyncpg
+import orjson
 
 
 def adjust_db_url(url):
@@ -15,3 +18,16 @@ def async_db_engine_creator(url):
         return asyncpg.connect(url_to_connect)
 
     return creator
+
+
+def json_serializer(value: Any) -> str:
+    """
+    Engine-wide JSON serializer for bound JSON/JSONB values, using orjson rather
+    than the stdlib json module.
+    """
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        # orjson rejects some values the stdlib accepts, e.g. integers wider
+        # than 64 bits
+        return json.dumps(value)
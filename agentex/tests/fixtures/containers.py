@@ -5,6 +5,8 @@ import pytest
 import pytest_asyncio
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.adapters.orm import BaseORM
+from src.utils.database import json_serializer
 from testcontainers.mongodb import MongoDbContainer
 from testcontainers.postgres import PostgresContainer
 from testcontainers.redis import RedisContainer
@@ -12,7 +14,11 @@ from testcontainers.redis import RedisContainer
 
 @pytest.fixture(scope="session")
 def postgres_container():
-    """Single PostgreSQL container for testing with improved stability"""
+    """
+    Single PostgreSQL container for testing with improved stability.
+    Session fixtures are per process, so under pytest-xdist every worker gets
+    its own container and the workers never share database state.
+    """
     with PostgresContainer("postgres:17") as container:
         # Wait a bit for PostgreSQL to be fully ready
         time.sleep(3)
@@ -117,17 +123,11 @@ async def postgres_session_maker(postgres_url):
     # Wait for database readiness and create tables
     for attempt in range(10):
         try:
-            engine = create_async_engine(sqlalchemy_asyncpg_url, echo=False)
+            engine = create_async_engine(
+                sqlalchemy_asyncpg_url, echo=False, json_serializer=json_serializer
+            )
             async with engine.begin() as conn:
-                # Import and create all tables
-                import os
-                import sys
-
-                sys.path.append(
-                    os.path.join(os.path.dirname(__file__), "..", "..", "src")
-                )
-                from adapters.orm import BaseORM
-
+                # Create all tables
                 await conn.run_sync(BaseORM.metadata.create_all)
                 # Test connectivity
                 await conn.execute(text("SELECT 1"))
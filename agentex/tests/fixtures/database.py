@@ -1,10 +1,14 @@
 import os
 import time
+from collections import defaultdict
+from collections.abc import Sequence
 
 import pytest
 import redis.asyncio as redis
 from pymongo import AsyncMongoClient
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import sort_tables
+from src.utils.database import json_serializer
 
 
 @pytest.fixture(scope="session")
@@ -14,11 +18,45 @@ async def test_engine(postgres_url):
     asyncpg_url = postgres_url.replace(
         "postgresql+psycopg2://", "postgresql+asyncpg://"
     )
-    engine = create_async_engine(asyncpg_url, echo=True)
+    engine = create_async_engine(
+        asyncpg_url, echo=True, json_serializer=json_serializer
+    )
     yield engine
     await engine.dispose()
 
 
+@pytest.fixture
+def isolated_session_maker(isolated_test_schema):
+    """
+    Session maker bound to the isolated schema engine, shared by the repository
+    tests instead of each building its own engine and session maker.
+    """
+    return async_sessionmaker(
+        isolated_test_schema["postgres_engine"], expire_on_commit=False
+    )
+
+
+# =============================================================================
+# SHARED HELPERS - Seeding rows without per-row repository round-trips
+# =============================================================================
+
+
+async def bulk_insert(session: AsyncSession, rows: Sequence) -> None:
+    """
+    Insert ORM rows of any mapped type with one multi-row INSERT per table.
+    Most models declare foreign keys without relationships, so the unit of work
+    cannot order them; rows are flushed table by table in foreign key
+    dependency order instead. The caller owns the transaction and commits it.
+    """
+    rows_by_table = defaultdict(list)
+    for row in rows:
+        rows_by_table[row.__table__].append(row)
+
+    for table in sort_tables(rows_by_table):
+        session.add_all(rows_by_table[table])
+        await session.flush()
+
+
 # =============================================================================
 # SHARED BASE FIXTURES - Used by both unit and integration tests
 # =============================================================================
@@ -21,6 +21,7 @@ from src.api.app import app, fastapi_app
 from src.api.authentication_cache import reset_auth_cache
 from src.config.dependencies import GlobalDependencies
 from src.config.environment_variables import EnvironmentVariables
+from src.utils.database import json_serializer
 
 from tests.fixtures.services import make_noop_authorization_service
 
@@ -141,6 +142,7 @@ async def isolated_test_schema(integration_test_db_urls):
             pool_timeout=30,  # Longer timeout
             pool_recycle=300,
             connect_args={"server_settings": {"search_path": schema_name}},
+            json_serializer=json_serializer,
         )
 
         # Create all tables in the isolated schema with retry logic
@@ -26,29 +26,39 @@ def _dep_callable(annotation):
     return annotation.__metadata__[0].dependency
 
 
+@pytest.fixture
+def authorization():
+    """Authorization service whose checks pass; tests set side_effect to deny."""
+    authorization = MagicMock()
+    authorization.check = AsyncMock(return_value=True)
+    return authorization
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestCheckApiKeyOrCollapseTo404:
     """Helper collapses unreadable api_keys while preserving denied operations."""
 
-    async def test_allowed_check_returns_normally(self):
-        authorization = MagicMock()
-        authorization.check = AsyncMock(return_value=True)
-
+    @pytest.mark.parametrize(
+        "operation",
+        [AuthorizedOperationType.read, AuthorizedOperationType.delete],
+        ids=["read", "delete"],
+    )
+    async def test_allowed_check_returns_normally(self, authorization, operation):
+        """Helper forwards the operation verbatim."""
         await _check_api_key_or_collapse_to_404(
             authorization,
             "api-key-1",
-            AuthorizedOperationType.read,
+            operation,
         )
 
         authorization.check.assert_awaited_once()
         called_kwargs = authorization.check.await_args.kwargs
         assert called_kwargs["resource"] == AgentexResource.api_key("api-key-1")
-        assert called_kwargs["operation"] == AuthorizedOperationType.read
+        assert called_kwargs["operation"] == operation
 
-    async def test_denied_read_collapses_to_not_found(self):
-        authorization = MagicMock()
-        authorization.check = AsyncMock(side_effect=AuthorizationError("denied"))
+    async def test_denied_read_collapses_to_not_found(self, authorization):
+        authorization.check.side_effect = AuthorizationError("denied")
 
         with pytest.raises(ItemDoesNotExist):
             await _check_api_key_or_collapse_to_404(
@@ -59,9 +69,10 @@ class TestCheckApiKeyOrCollapseTo404:
 
         authorization.check.assert_awaited_once()
 
-    async def test_denied_non_read_collapses_to_not_found_when_read_denied(self):
-        authorization = MagicMock()
-        authorization.check = AsyncMock(side_effect=AuthorizationError("denied"))
+    async def test_denied_non_read_collapses_to_not_found_when_read_denied(
+        self, authorization
+    ):
+        authorization.check.side_effect = AuthorizationError("denied")
 
         with pytest.raises(ItemDoesNotExist):
             await _check_api_key_or_collapse_to_404(
@@ -75,10 +86,11 @@ class TestCheckApiKeyOrCollapseTo404:
         assert first_call.kwargs["operation"] == AuthorizedOperationType.delete
         assert second_call.kwargs["operation"] == AuthorizedOperationType.read
 
-    async def test_denied_non_read_surfaces_authorization_error_when_read_allowed(self):
-        authorization = MagicMock()
+    async def test_denied_non_read_surfaces_authorization_error_when_read_allowed(
+        self, authorization
+    ):
         operation_denied = AuthorizationError("denied")
-        authorization.check = AsyncMock(side_effect=[operation_denied, True])
+        authorization.check.side_effect = [operation_denied, True]
 
         with pytest.raises(AuthorizationError) as exc_info:
             await _check_api_key_or_collapse_to_404(
@@ -89,27 +101,13 @@ class TestCheckApiKeyOrCollapseTo404:
 
         assert exc_info.value is operation_denied
 
-    async def test_uses_delete_operation_on_delete_routes(self):
-        """Helper forwards the operation verbatim."""
-        authorization = MagicMock()
-        authorization.check = AsyncMock(return_value=True)
-
-        await _check_api_key_or_collapse_to_404(
-            authorization,
-            "api-key-2",
-            AuthorizedOperationType.delete,
-        )
-
-        called_kwargs = authorization.check.await_args.kwargs
-        assert called_kwargs["operation"] == AuthorizedOperationType.delete
-
 
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestDAuthorizedIdApiKeyWrap:
     """``DAuthorizedId(api_key, ...)`` routes through the api_key authz wrapper."""
 
-    async def test_api_key_id_routes_through_wrap_on_denial(self):
+    async def test_api_key_id_routes_through_wrap_on_denial(self, authorization):
         annotation = DAuthorizedId(
             AgentexResourceType.api_key,
             AuthorizedOperationType.read,
@@ -117,8 +115,7 @@ class TestDAuthorizedIdApiKeyWrap:
         )
         dep = _dep_callable(annotation)
 
-        authorization = MagicMock()
-        authorization.check = AsyncMock(side_effect=AuthorizationError("denied"))
+        authorization.check.side_effect = AuthorizationError("denied")
         state_repository = MagicMock()
         message_repository = MagicMock()
         tracker_repository = MagicMock()
@@ -132,17 +129,22 @@ class TestDAuthorizedIdApiKeyWrap:
                 "api-key-7",
             )
 
-    async def test_api_key_id_returns_resource_id_when_allowed(self):
+    @pytest.mark.parametrize(
+        "operation",
+        [AuthorizedOperationType.read, AuthorizedOperationType.delete],
+        ids=["read", "delete"],
+    )
+    async def test_api_key_id_returns_resource_id_when_allowed(
+        self, authorization, operation
+    ):
+        """The operation is forwarded to ``authorization.check``."""
         annotation = DAuthorizedId(
             AgentexResourceType.api_key,
-            AuthorizedOperationType.read,
+            operation,
             param_name="id",
         )
         dep = _dep_callable(annotation)
 
-        authorization = MagicMock()
-        authorization.check = AsyncMock(return_value=True)
-
         result = await dep(
             authorization, MagicMock(), MagicMock(), MagicMock(), "api-key-9"
         )
@@ -150,26 +152,10 @@ class TestDAuthorizedIdApiKeyWrap:
         assert result == "api-key-9"
         called_kwargs = authorization.check.await_args.kwargs
         assert called_kwargs["resource"] == AgentexResource.api_key("api-key-9")
-
-    async def test_api_key_delete_op_propagated_to_check(self):
-        """Delete op is forwarded to ``authorization.check``."""
-        annotation = DAuthorizedId(
-            AgentexResourceType.api_key,
-            AuthorizedOperationType.delete,
-            param_name="id",
-        )
-        dep = _dep_callable(annotation)
-
-        authorization = MagicMock()
-        authorization.check = AsyncMock(return_value=True)
-
-        await dep(authorization, MagicMock(), MagicMock(), MagicMock(), "api-key-del")
-
-        called_kwargs = authorization.check.await_args.kwargs
-        assert called_kwargs["operation"] == AuthorizedOperationType.delete
+        assert called_kwargs["operation"] == operation
 
     async def test_api_key_delete_denied_when_readable_surfaces_authorization_error(
-        self,
+        self, authorization
     ):
         annotation = DAuthorizedId(
             AgentexResourceType.api_key,
@@ -178,10 +164,7 @@ class TestDAuthorizedIdApiKeyWrap:
         )
         dep = _dep_callable(annotation)
 
-        authorization = MagicMock()
-        authorization.check = AsyncMock(
-            side_effect=[AuthorizationError("delete denied"), True]
-        )
+        authorization.check.side_effect = [AuthorizationError("delete denied"), True]
 
         with pytest.raises(AuthorizationError):
             await dep(
@@ -198,7 +181,7 @@ class TestDAuthorizedIdApiKeyWrap:
 class TestNameRouteCollapse:
     """Name-route handlers call the api_key visibility helper inline."""
 
-    async def test_get_by_name_handler_collapses_denial_to_404(self):
+    async def test_get_by_name_handler_collapses_denial_to_404(self, authorization):
         from src.api.routes.agent_api_keys import get_agent_api_key_by_name
 
         agent_use_case = MagicMock()
@@ -207,8 +190,7 @@ class TestNameRouteCollapse:
         api_key_use_case.get_by_agent_id_and_name = AsyncMock(
             return_value=MagicMock(id="api-key-named", name="prod-key")
         )
-        authorization = MagicMock()
-        authorization.check = AsyncMock(side_effect=AuthorizationError("denied"))
+        authorization.check.side_effect = AuthorizationError("denied")
 
         with pytest.raises(ItemDoesNotExist):
             await get_agent_api_key_by_name(
@@ -227,7 +209,7 @@ class TestNameRouteCollapse:
         called_kwargs = authorization.check.await_args.kwargs
         assert called_kwargs["resource"] == AgentexResource.api_key("api-key-named")
 
-    async def test_delete_by_name_handler_collapses_denial_to_404(self):
+    async def test_delete_by_name_handler_collapses_denial_to_404(self, authorization):
         from src.api.routes.agent_api_keys import delete_agent_api_key_by_name
 
         agent_use_case = MagicMock()
@@ -237,8 +219,7 @@ class TestNameRouteCollapse:
             return_value=MagicMock(id="api-key-named")
         )
         api_key_use_case.delete_by_agent_id_and_key_name = AsyncMock()
-        authorization = MagicMock()
-        authorization.check = AsyncMock(side_effect=AuthorizationError("denied"))
+        authorization.check.side_effect = AuthorizationError("denied")
         authorization.principal_context = MagicMock(account_id="acct-1")
 
         with pytest.raises(ItemDoesNotExist):
@@ -258,7 +239,9 @@ class TestNameRouteCollapse:
         assert first_call.kwargs["operation"] == AuthorizedOperationType.delete
         assert second_call.kwargs["operation"] == AuthorizedOperationType.read
 
-    async def test_delete_by_name_handler_surfaces_403_when_readable(self):
+    async def test_delete_by_name_handler_surfaces_403_when_readable(
+        self, authorization
+    ):
         from src.api.routes.agent_api_keys import delete_agent_api_key_by_name
 
         agent_use_case = MagicMock()
@@ -268,10 +251,7 @@ class TestNameRouteCollapse:
             return_value=MagicMock(id="api-key-named")
         )
         api_key_use_case.delete_by_agent_id_and_key_name = AsyncMock()
-        authorization = MagicMock()
-        authorization.check = AsyncMock(
-            side_effect=[AuthorizationError("delete denied"), True]
-        )
+        authorization.check.side_effect = [AuthorizationError("delete denied"), True]
         authorization.principal_context = MagicMock(account_id="acct-1")
 
         with pytest.raises(AuthorizationError):
@@ -393,7 +373,7 @@ class TestListFiltering:
 class TestCreateParentAgentCheck:
     """``create_api_key`` gates on parent ``agent.update`` (no api_key row yet)."""
 
-    async def test_create_checks_parent_agent_update(self):
+    async def test_create_checks_parent_agent_update(self, authorization):
         from src.api.routes.agent_api_keys import create_api_key
         from src.api.schemas.agent_api_keys import CreateAPIKeyRequest
         from src.domain.entities.agent_api_keys import AgentAPIKeyType
@@ -411,8 +391,6 @@ class TestCreateParentAgentCheck:
         created_entity.name = "prod-key"
         created_entity.api_key_type = AgentAPIKeyType.EXTERNAL
         api_key_use_case.create = AsyncMock(return_value=created_entity)
-        authorization = MagicMock()
-        authorization.check = AsyncMock(return_value=True)
         authorization.principal_context = MagicMock(account_id="acct-1")
 
         request = CreateAPIKeyRequest(
@@ -435,7 +413,9 @@ class TestCreateParentAgentCheck:
         assert called_kwargs["resource"] == AgentexResource.agent("agent-1")
         assert called_kwargs["operation"] == AuthorizedOperationType.update
 
-    async def test_create_denied_on_parent_agent_collapses_when_read_denied(self):
+    async def test_create_denied_on_parent_agent_collapses_when_read_denied(
+        self, authorization
+    ):
         from src.api.routes.agent_api_keys import create_api_key
         from src.api.schemas.agent_api_keys import CreateAPIKeyRequest
         from src.domain.entities.agent_api_keys import AgentAPIKeyType
@@ -445,13 +425,10 @@ class TestCreateParentAgentCheck:
         api_key_use_case = MagicMock()
         api_key_use_case.get_by_agent_id_and_name = AsyncMock()
         api_key_use_case.create = AsyncMock()
-        authorization = MagicMock()
-        authorization.check = AsyncMock(
-            side_effect=[
-                AuthorizationError("update denied"),
-                AuthorizationError("read denied"),
-            ]
-        )
+        authorization.check.side_effect = [
+            AuthorizationError("update denied"),
+            AuthorizationError("read denied"),
+        ]
 
         request = CreateAPIKeyRequest(
             agent_id="agent-1",
@@ -475,7 +452,9 @@ class TestCreateParentAgentCheck:
         api_key_use_case.get_by_agent_id_and_name.assert_not_called()
         api_key_use_case.create.assert_not_called()
 
-    async def test_create_denied_on_readable_parent_agent_propagates_403(self):
+    async def test_create_denied_on_readable_parent_agent_propagates_403(
+        self, authorization
+    ):
         from src.api.routes.agent_api_keys import create_api_key
         from src.api.schemas.agent_api_keys import CreateAPIKeyRequest
         from src.domain.entities.agent_api_keys import AgentAPIKeyType
@@ -485,9 +464,8 @@ class TestCreateParentAgentCheck:
         api_key_use_case = MagicMock()
         api_key_use_case.get_by_agent_id_and_name = AsyncMock()
         api_key_use_case.create = AsyncMock()
-        authorization = MagicMock()
         operation_denied = AuthorizationError("update denied")
-        authorization.check = AsyncMock(side_effect=[operation_denied, True])
+        authorization.check.side_effect = [operation_denied, True]
 
         request = CreateAPIKeyRequest(
             agent_id="agent-1",
@@ -401,7 +401,11 @@ class TestRegisterAgentOwnershipEnforcement:
             principal_context=principal_context,
         )
 
-    @pytest.mark.parametrize("principal_context", [None, {}, {"account_id": "acct"}])
+    @pytest.mark.parametrize(
+        "principal_context",
+        [None, {}, {"account_id": "acct"}],
+        ids=["none", "empty", "no_creator_id"],
+    )
     async def test_unresolvable_creator_skips_check_and_grant(self, principal_context):
         # None (whitelisted self-reg), an empty dict, or a principal with no
         # user_id/service_account_id all mean "no creator" -> skip, don't 422.
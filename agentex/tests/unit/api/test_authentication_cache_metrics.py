@@ -9,35 +9,48 @@ separately; here we patch the recorder functions at their import site in
 
 from __future__ import annotations
 
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
 import pytest
+from src.api import authentication_cache as authentication_cache_module
 from src.api.authentication_cache import AsyncTTLCache, AuthenticationCache
 
 
+@pytest.fixture
+def record_access(monkeypatch):
+    recorder = MagicMock()
+    monkeypatch.setattr(authentication_cache_module, "record_cache_access", recorder)
+    return recorder
+
+
+@pytest.fixture
+def record_eviction(monkeypatch):
+    recorder = MagicMock()
+    monkeypatch.setattr(authentication_cache_module, "record_cache_eviction", recorder)
+    return recorder
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestAsyncTTLCacheMetrics:
-    async def test_hit_records_hit(self):
+    async def test_hit_records_hit(self, record_access):
         cache = AsyncTTLCache(name="agent_api_key", ttl_seconds=300)
         await cache.set("k", "v")
 
-        with patch("src.api.authentication_cache.record_cache_access") as record_access:
-            result = await cache.get("k")
+        result = await cache.get("k")
 
         assert result == "v"
         record_access.assert_called_once_with("agent_api_key", "hit")
 
-    async def test_absent_key_records_miss_absent(self):
+    async def test_absent_key_records_miss_absent(self, record_access):
         cache = AsyncTTLCache(name="auth_gateway", ttl_seconds=300)
 
-        with patch("src.api.authentication_cache.record_cache_access") as record_access:
-            result = await cache.get("never-set")
+        result = await cache.get("never-set")
 
         assert result is None
         record_access.assert_called_once_with("auth_gateway", "miss_absent")
 
-    async def test_expired_entry_records_miss_expired(self):
+    async def test_expired_entry_records_miss_expired(self, record_access):
         cache = AsyncTTLCache(name="auth_gateway", ttl_seconds=60)
         await cache.set("k", "v")
         # Force expiry deterministically by backdating the stored timestamp,
@@ -45,37 +58,30 @@ class TestAsyncTTLCacheMetrics:
         value, _ = cache.cache["k"]
         cache.cache["k"] = (value, 0.0)
 
-        with patch("src.api.authentication_cache.record_cache_access") as record_access:
-            result = await cache.get("k")
+        result = await cache.get("k")
 
         assert result is None
         record_access.assert_called_once_with("auth_gateway", "miss_expired")
         # The expired entry should also have been purged from the cache.
         assert "k" not in cache.cache
 
-    async def test_capacity_eviction_records_eviction(self):
+    async def test_capacity_eviction_records_eviction(self, record_eviction):
         cache = AsyncTTLCache(name="authorization_check", max_size=1, ttl_seconds=300)
         await cache.set("first", "v1")
 
-        with patch(
-            "src.api.authentication_cache.record_cache_eviction"
-        ) as record_eviction:
-            # Inserting a second distinct key evicts the oldest (LRU).
-            await cache.set("second", "v2")
+        # Inserting a second distinct key evicts the oldest (LRU).
+        await cache.set("second", "v2")
 
         record_eviction.assert_called_once_with("authorization_check")
         assert "first" not in cache.cache
         assert "second" in cache.cache
 
-    async def test_overwriting_existing_key_does_not_evict(self):
+    async def test_overwriting_existing_key_does_not_evict(self, record_eviction):
         cache = AsyncTTLCache(name="authorization_check", max_size=1, ttl_seconds=300)
         await cache.set("k", "v1")
 
-        with patch(
-            "src.api.authentication_cache.record_cache_eviction"
-        ) as record_eviction:
-            # Re-setting an existing key is an update, not a capacity eviction.
-            await cache.set("k", "v2")
+        # Re-setting an existing key is an update, not a capacity eviction.
+        await cache.set("k", "v2")
 
         record_eviction.assert_not_called()
         assert await cache.get("k") == "v2"
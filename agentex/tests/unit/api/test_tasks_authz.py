@@ -13,7 +13,7 @@ authorization cluster.
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, NonCallableMagicMock
 
 import pytest
 from src.adapters.authorization.exceptions import AuthorizationError
@@ -23,6 +23,8 @@ from src.api.schemas.authorization_types import (
     AgentexResourceType,
     AuthorizedOperationType,
 )
+from src.domain.repositories.agent_repository import AgentRepository
+from src.domain.repositories.task_repository import TaskRepository
 from src.utils.authorization_shortcuts import (
     DAuthorizedBodyId,
     DAuthorizedName,
@@ -609,8 +611,8 @@ class TestDAuthorizedNameTaskWrap:
 
         authorization = MagicMock()
         authorization.check = AsyncMock(side_effect=AuthorizationError("denied"))
-        agent_repository = MagicMock()
-        task_repository = MagicMock()
+        agent_repository = NonCallableMagicMock(spec=AgentRepository)
+        task_repository = NonCallableMagicMock(spec=TaskRepository)
         task_repository.get = AsyncMock(return_value=MagicMock(id="task-resolved"))
 
         with pytest.raises(ItemDoesNotExist):
@@ -633,8 +635,8 @@ class TestDAuthorizedNameTaskWrap:
         authorization.check = AsyncMock(
             side_effect=[AuthorizationError("update denied"), True]
         )
-        agent_repository = MagicMock()
-        task_repository = MagicMock()
+        agent_repository = NonCallableMagicMock(spec=AgentRepository)
+        task_repository = NonCallableMagicMock(spec=TaskRepository)
         task_repository.get = AsyncMock(return_value=MagicMock(id="task-resolved"))
 
         with pytest.raises(AuthorizationError):
@@ -648,8 +650,8 @@ class TestDAuthorizedNameTaskWrap:
 
         authorization = MagicMock()
         authorization.check = AsyncMock(return_value=True)
-        agent_repository = MagicMock()
-        task_repository = MagicMock()
+        agent_repository = NonCallableMagicMock(spec=AgentRepository)
+        task_repository = NonCallableMagicMock(spec=TaskRepository)
         task_repository.get = AsyncMock(return_value=MagicMock(id="task-allow"))
 
         result = await dep(authorization, agent_repository, task_repository, "ok-name")
@@ -671,9 +673,9 @@ class TestDAuthorizedNameTaskWrap:
 
         authorization = MagicMock()
         authorization.check = AsyncMock(side_effect=AuthorizationError("denied"))
-        agent_repository = MagicMock()
+        agent_repository = NonCallableMagicMock(spec=AgentRepository)
         agent_repository.get = AsyncMock(return_value=MagicMock(id="agent-1"))
-        task_repository = MagicMock()
+        task_repository = NonCallableMagicMock(spec=TaskRepository)
 
         with pytest.raises(ItemDoesNotExist):
             await dep(authorization, agent_repository, task_repository, "agent-name")
@@ -38,11 +38,19 @@ async def test_transactional_rollback_proof(postgres_url):
         # Test 2: Verify rollback works
         try:
             async with engine.begin() as conn:
-                await conn.execute(
-                    text("INSERT INTO test_rollback (name) VALUES ('should-rollback')")
+                # Insert and count in one round-trip. A RETURNING subquery sees
+                # the snapshot from before the statement, so the new row is
+                # added from the data-modifying CTE.
+                result = await conn.execute(
+                    text(
+                        "WITH inserted AS ("
+                        "INSERT INTO test_rollback (name) VALUES ('should-rollback') "
+                        "RETURNING id) "
+                        "SELECT (SELECT COUNT(*) FROM test_rollback) "
+                        "+ (SELECT COUNT(*) FROM inserted)"
+                    )
                 )
                 # Should have 2 records now
-                result = await conn.execute(text("SELECT COUNT(*) FROM test_rollback"))
                 assert result.scalar() == 2
 
                 # Force a rollback by raising an exception
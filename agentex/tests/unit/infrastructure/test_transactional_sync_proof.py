@@ -7,15 +7,19 @@ from sqlalchemy import create_engine, text
 @pytest.mark.unit
 def test_sync_transactional_rollback_proof(postgres_url):
     """Prove that transactional rollback works with sync SQLAlchemy"""
-    # Use sync psycopg2 connection (already in correct format)
-    engine = create_engine(postgres_url, echo=True)
+    # Use psycopg (v3) so multi-statement blocks can run in libpq pipeline mode
+    psycopg_url = postgres_url.replace(
+        "postgresql+psycopg2://", "postgresql+psycopg://"
+    )
+    engine = create_engine(psycopg_url, echo=True)
 
     # Wait a bit for PostgreSQL to be fully ready
     time.sleep(2)
 
     try:
-        # First, set up clean test table
-        with engine.begin() as conn:
+        # First, set up clean test table. The DDL returns no rows, so both
+        # statements can be sent in one pipeline without waiting on each other.
+        with engine.begin() as conn, conn.connection.driver_connection.pipeline():
             conn.execute(text("DROP TABLE IF EXISTS test_rollback"))
             conn.execute(
                 text("CREATE TABLE test_rollback (id SERIAL PRIMARY KEY, name TEXT)")
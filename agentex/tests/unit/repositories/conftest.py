@@ -0,0 +1,242 @@
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from src.adapters.orm import BaseORM
+from src.domain.entities.agents import ACPType, AgentEntity, AgentStatus
+from src.domain.entities.tasks import TaskEntity, TaskStatus
+from src.domain.repositories.agent_repository import AgentRepository
+from src.domain.repositories.agent_task_tracker_repository import (
+    AgentTaskTrackerRepository,
+)
+from src.domain.repositories.event_repository import EventRepository
+from src.domain.repositories.span_repository import SpanRepository
+from src.domain.repositories.task_repository import TaskRepository
+from src.utils.database import json_serializer
+from src.utils.ids import orm_id
+
+# Connections the shared engine keeps open and warms before the first test
+POOL_SIZE = 5
+
+# Tables the repository tests write to; CASCADE also empties tables that
+# reference them
+TRUNCATE_REPOSITORY_TABLES = text(
+    "TRUNCATE agents, tasks, events, agent_task_tracker, spans RESTART IDENTITY CASCADE"
+)
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff capped at two seconds: 0.1s, 0.2s, 0.4s, ..."""
+    return min(0.1 * 2**attempt, 2.0)
+
+
+async def _wait_for_postgres(url: str, attempts: int = 10) -> None:
+    """
+    Poll the Postgres TCP port until it accepts connections. A bare socket is
+    far cheaper than an engine connect, so this fails fast while the server
+    starts up. Unix socket URLs have no host to probe and return immediately.
+    """
+    parsed = make_url(url)
+    if not parsed.host:
+        return
+
+    for attempt in range(attempts):
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(parsed.host, parsed.port or 5432), 0.5
+            )
+            writer.close()
+            await writer.wait_closed()
+            return
+        except (OSError, TimeoutError):
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(_backoff(attempt))
+
+
+async def _warm_pool(engine: AsyncEngine, size: int) -> None:
+    """
+    Open `size` connections concurrently and return them to the pool, so the
+    asyncpg startup and type introspection happen up front and in parallel
+    rather than one at a time inside the first tests.
+    """
+    connections = await asyncio.gather(*(engine.connect() for _ in range(size)))
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_async_engine(postgres_url):
+    """
+    Session-scoped async engine shared by the repository tests.
+    The readiness check and table creation run once per test session, so tests
+    using it must run on the session event loop (loop_scope="session").
+    """
+    # URL conversion for SQLAlchemy async
+    sqlalchemy_asyncpg_url = postgres_url.replace(
+        "postgresql+psycopg2://", "postgresql+asyncpg://"
+    )
+
+    # Wait for the server to accept connections before building the engine
+    await _wait_for_postgres(sqlalchemy_asyncpg_url)
+
+    engine = create_async_engine(
+        sqlalchemy_asyncpg_url,
+        # Statement logging formats every JSON bind parameter; opt in with SQL_ECHO=1
+        echo=os.getenv("SQL_ECHO") == "1",
+        json_serializer=json_serializer,
+        poolclass=AsyncAdaptedQueuePool,  # keep connections warm across tests
+        pool_size=POOL_SIZE,
+        max_overflow=5,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        connect_args={
+            # Repeated repository statements skip Parse after first use
+            "statement_cache_size": 500,
+            "prepared_statement_cache_size": 500,
+            # Short test queries never benefit from JIT compilation
+            "server_settings": {"jit": "off"},
+        },
+    )
+
+    # The port can open before Postgres accepts queries, so retry with backoff
+    for attempt in range(10):
+        try:
+            async with engine.begin() as conn:
+                # Create all tables unless another fixture already has; the
+                # lookup doubles as the connectivity check
+                schema_exists = await conn.scalar(
+                    text("SELECT to_regclass('agents') IS NOT NULL")
+                )
+                if not schema_exists:
+                    await conn.run_sync(BaseORM.metadata.create_all)
+            break
+        except Exception as e:
+            if attempt < 9:
+                print(
+                    f"Database not ready (attempt {attempt + 1}), retrying... Error: {e}"
+                )
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            await engine.dispose()
+            raise
+
+    await _warm_pool(engine, POOL_SIZE)
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def shared_session_maker(shared_async_engine):
+    """Session maker over the shared engine, built once per test session"""
+    return async_sessionmaker(shared_async_engine, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def rollback_session_maker(shared_async_engine):
+    """
+    Session maker bound to one connection whose outer transaction is rolled
+    back after the test. Repository commits only release a SAVEPOINT, so the
+    test's rows never become visible to other tests and need no cleanup.
+    The transaction starts by truncating the repository tables, so the test
+    sees only its own rows even when other modules committed to the same
+    database; the rollback restores them. Sessions share the connection, so
+    their operations must not run concurrently.
+    """
+    async with shared_async_engine.connect() as conn:
+        transaction = await conn.begin()
+        await conn.execute(TRUNCATE_REPOSITORY_TABLES)
+        yield async_sessionmaker(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        await transaction.rollback()
+
+
+@pytest.fixture
+def select_statements(shared_async_engine):
+    """
+    SELECT statements sent through the shared engine during the test, so tests
+    can assert a query does not fan out into one statement per row. SAVEPOINT
+    and other transaction statements are not recorded.
+    """
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    sync_engine = shared_async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(sync_engine, "before_cursor_execute", record)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def clean_db(shared_async_engine):
+    """
+    Empty the tables the tracker, event and span tests write to before the
+    test, in a single statement, so rows committed by earlier tests in any
+    module do not leak into it. CASCADE also clears rows in tables that
+    reference them.
+    """
+    async with shared_async_engine.begin() as conn:
+        # Test data is disposable, so the cleanup commit need not wait for the
+        # WAL flush
+        await conn.execute(text("SET LOCAL synchronous_commit = OFF"))
+        await conn.execute(TRUNCATE_REPOSITORY_TABLES)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def agent_task_prereqs(clean_db, shared_session_maker):
+    """
+    Agent and task (with its automatically created tracker) for the tracker,
+    event and span tests, plus repositories over the shared session maker.
+    Starts from empty tables; names still embed the IDs so they stay unique
+    against rows written by tests that do not use this fixture.
+    """
+    agent_repository = AgentRepository(shared_session_maker, shared_session_maker)
+    task_repository = TaskRepository(shared_session_maker, shared_session_maker)
+
+    agent_id = orm_id()
+    await agent_repository.create(
+        AgentEntity(
+            id=agent_id,
+            name=f"test-agent-{agent_id}",
+            description="Test agent for repository testing",
+            docker_image="test/agent:latest",
+            status=AgentStatus.READY,
+            acp_url="http://localhost:8000/acp",
+            acp_type=ACPType.ASYNC,
+        )
+    )
+
+    # Note: TaskRepository.create() automatically creates an AgentTaskTracker
+    task_id = orm_id()
+    await task_repository.create(
+        agent_id,
+        TaskEntity(
+            id=task_id,
+            name=f"test-task-{task_id}",
+            status=TaskStatus.RUNNING,
+            status_reason="Task is running for repository testing",
+        ),
+    )
+
+    return {
+        "agent_id": agent_id,
+        "task_id": task_id,
+        "agent_repository": agent_repository,
+        "task_repository": task_repository,
+        "event_repository": EventRepository(shared_session_maker, shared_session_maker),
+        "agent_task_tracker_repository": AgentTaskTrackerRepository(
+            shared_session_maker, shared_session_maker
+        ),
+        "span_repository": SpanRepository(shared_session_maker, shared_session_maker),
+    }
@@ -1,56 +1,22 @@
-import asyncio
-import os
-
-# Import the repository and entities we need to test
-import sys
 from uuid import uuid4
 
 import pytest
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
-
-from adapters.orm import BaseORM
-from domain.entities.agents import ACPType, AgentEntity, AgentStatus
-from domain.repositories.agent_repository import AgentRepository
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from src.domain.entities.agents import ACPType, AgentEntity, AgentStatus
+from src.domain.repositories.agent_repository import AgentRepository
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_agent_repository_crud_operations(postgres_url, isolated_test_schema):
+async def test_agent_repository_crud_operations(
+    isolated_test_schema, isolated_session_maker
+):
     """Test comprehensive CRUD operations for AgentRepository"""
 
-    # URL conversion for SQLAlchemy async
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
-    )
-
-    # Wait for database readiness
-    for attempt in range(10):
-        try:
-            engine = create_async_engine(
-                sqlalchemy_asyncpg_url,
-                echo=True,
-                connect_args={
-                    "server_settings": {
-                        "search_path": isolated_test_schema["schema_name"]
-                    }
-                },
-            )
-            async with engine.begin() as conn:
-                await conn.execute(text("SELECT 1"))
-            break
-        except Exception:
-            if attempt == 9:
-                raise
-            await asyncio.sleep(0.2)
+    # The fixture has already created the tables in the isolated schema
+    engine = isolated_test_schema["postgres_engine"]
 
     try:
-        # Create all tables
-        async with engine.begin() as conn:
-            await conn.run_sync(BaseORM.metadata.create_all)
-
         # Test in a transaction that will rollback
         async with engine.begin() as conn:
             # Bind session to this connection for transactional isolation
@@ -158,29 +124,15 @@ async def test_agent_repository_crud_operations(postgres_url, isolated_test_sche
             raise
         print("✅ Transaction rollback forced for test isolation")
 
-    finally:
-        await engine.dispose()
-
-    # Test 9: Verify rollback worked - create new engine and check
-    engine2 = create_async_engine(
-        sqlalchemy_asyncpg_url,
-        echo=False,
-        connect_args={
-            "server_settings": {"search_path": isolated_test_schema["schema_name"]}
-        },
-    )
-    try:
-        session_maker2 = async_sessionmaker(engine2)
-        repository2 = AgentRepository(session_maker2, session_maker2)
-
-        # Should be empty after rollback
-        agent_list = await repository2.list()
-        assert (
-            len(agent_list) == 0
-        ), f"Expected 0 agents after rollback, got {len(agent_list)}"
-        print("✅ TRANSACTION ROLLBACK verification successful")
-
-    finally:
-        await engine2.dispose()
+    # Test 10: Verify rollback worked - a new session on the isolated schema
+    # engine must not see the agents created inside the rolled back transaction
+    repository = AgentRepository(isolated_session_maker, isolated_session_maker)
+
+    # Should be empty after rollback
+    agent_list = await repository.list()
+    assert (
+        len(agent_list) == 0
+    ), f"Expected 0 agents after rollback, got {len(agent_list)}"
+    print("✅ TRANSACTION ROLLBACK verification successful")
 
     print("🎉 ALL AGENT REPOSITORY TESTS PASSED!")
@@ -2,143 +2,74 @@ import asyncio
 
 # Import the repository and entities we need to test
 import pytest
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from src.adapters.orm import BaseORM
+from src.adapters.crud_store.exceptions import ItemDoesNotExist
 from src.api.schemas.task_messages import TextContent
-from src.domain.entities.agents import ACPType, AgentEntity, AgentStatus
 from src.domain.entities.task_messages import (
     MessageAuthor,
     TaskMessageContentType,
 )
-from src.domain.entities.tasks import TaskEntity, TaskStatus
-from src.domain.repositories.agent_repository import AgentRepository
-from src.domain.repositories.agent_task_tracker_repository import (
-    AgentTaskTrackerRepository,
-)
-from src.domain.repositories.event_repository import EventRepository
-from src.domain.repositories.task_repository import TaskRepository
 from src.utils.ids import orm_id
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.unit
-async def test_agent_task_tracker_repository_crud_operations(postgres_url):
+async def test_agent_task_tracker_repository_crud_operations(agent_task_prereqs):
     """Test AgentTaskTrackerRepository CRUD operations with row locking and cursor validation"""
 
-    # URL conversion for SQLAlchemy async
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
-    )
-
-    # Wait for database readiness
-    for attempt in range(10):
-        try:
-            engine = create_async_engine(sqlalchemy_asyncpg_url, echo=True)
-            async with engine.begin() as conn:
-                # Create all tables
-                await conn.run_sync(BaseORM.metadata.create_all)
-                # Test connectivity
-                await conn.execute(text("SELECT 1"))
-            break
-        except Exception as e:
-            if attempt < 9:
-                print(
-                    f"Database not ready (attempt {attempt + 1}), retrying... Error: {e}"
-                )
-                await asyncio.sleep(2)
-                continue
-            raise
-
-    # Create async session maker
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-
-    # Create repositories
-    tracker_repo = AgentTaskTrackerRepository(async_session_maker, async_session_maker)
-    agent_repo = AgentRepository(async_session_maker, async_session_maker)
-    task_repo = TaskRepository(async_session_maker, async_session_maker)
-    event_repo = EventRepository(async_session_maker, async_session_maker)
-
-    # First, create prerequisites: Agent and Task
-    agent_id = orm_id()
-    agent = AgentEntity(
-        id=agent_id,
-        name="test-agent-for-tracker",
-        description="Test agent for tracker repository testing",
-        docker_image="test/agent:latest",
-        status=AgentStatus.READY,
-        acp_url="http://localhost:8000/acp",
-        acp_type=ACPType.ASYNC,
-    )
-
-    created_agent = await agent_repo.create(agent)
-    print(f"✅ Agent created for tracker testing: {created_agent.id}")
-
-    task_id = orm_id()
-    task = TaskEntity(
-        id=task_id,
-        name="test-task-for-tracker",
-        status=TaskStatus.RUNNING,
-        status_reason="Task is running for tracker testing",
-    )
-
-    # Note: TaskRepository.create() automatically creates an AgentTaskTracker
-    created_task = await task_repo.create(agent_id, task)
-    print(f"✅ Task created for tracker testing: {created_task.id}")
+    tracker_repo = agent_task_prereqs["agent_task_tracker_repository"]
+    event_repo = agent_task_prereqs["event_repository"]
+    agent_id = agent_task_prereqs["agent_id"]
+    task_id = agent_task_prereqs["task_id"]
 
     # The task creation should have automatically created an AgentTaskTracker
     # Let's find it and test our operations
-    all_trackers = await tracker_repo.list()
-    assert (
-        len(all_trackers) >= 1
-    ), "Task creation should have created an AgentTaskTracker"
-
-    # Find our tracker
-    our_tracker = None
-    for tracker in all_trackers:
-        if tracker.agent_id == agent_id and tracker.task_id == task_id:
-            our_tracker = tracker
-            break
-
-    assert our_tracker is not None, "Could not find the automatically created tracker"
+    our_tracker = await tracker_repo.get_by_agent_task(
+        agent_id=agent_id, task_id=task_id
+    )
+    assert our_tracker.agent_id == agent_id
+    assert our_tracker.task_id == task_id
     tracker_id = our_tracker.id
     print(f"✅ Found automatically created tracker: {tracker_id}")
 
+    # Create some events to test cursor management in one batch
+    event_id_1 = orm_id()
+    event_id_2 = orm_id()
+    # GET and the event batch are independent, so issue them concurrently
+    retrieved_tracker, (created_event_1, created_event_2) = await asyncio.gather(
+        tracker_repo.get(id=tracker_id),
+        event_repo.create_many(
+            task_id=task_id,
+            agent_id=agent_id,
+            events=[
+                (
+                    event_id_1,
+                    TextContent(
+                        type=TaskMessageContentType.TEXT,
+                        author=MessageAuthor.AGENT,
+                        content="First event for tracker testing",
+                    ),
+                ),
+                (
+                    event_id_2,
+                    TextContent(
+                        type=TaskMessageContentType.TEXT,
+                        author=MessageAuthor.USER,
+                        content="Second event for tracker testing",
+                    ),
+                ),
+            ],
+        ),
+    )
+    print(f"✅ Event 1 created: {event_id_1} (sequence: {created_event_1.sequence_id})")
+    print(f"✅ Event 2 created: {event_id_2} (sequence: {created_event_2.sequence_id})")
+
     # Test GET operation
-    retrieved_tracker = await tracker_repo.get(id=tracker_id)
     assert retrieved_tracker.id == tracker_id
     assert retrieved_tracker.agent_id == agent_id
     assert retrieved_tracker.task_id == task_id
     assert retrieved_tracker.created_at is not None
     print("✅ GET operation successful")
 
-    # Create some events to test cursor management
-    event_id_1 = orm_id()
-    created_event_1 = await event_repo.create(
-        id=event_id_1,
-        task_id=task_id,
-        agent_id=agent_id,
-        content=TextContent(
-            type=TaskMessageContentType.TEXT,
-            author=MessageAuthor.AGENT,
-            content="First event for tracker testing",
-        ),
-    )
-    print(f"✅ Event 1 created: {event_id_1} (sequence: {created_event_1.sequence_id})")
-
-    event_id_2 = orm_id()
-    created_event_2 = await event_repo.create(
-        id=event_id_2,
-        task_id=task_id,
-        agent_id=agent_id,
-        content=TextContent(
-            type=TaskMessageContentType.TEXT,
-            author=MessageAuthor.USER,
-            content="Second event for tracker testing",
-        ),
-    )
-    print(f"✅ Event 2 created: {event_id_2} (sequence: {created_event_2.sequence_id})")
-
     # Test update_agent_task_tracker with cursor advancement
     updated_tracker_1 = await tracker_repo.update_agent_task_tracker(
         id=tracker_id,
@@ -209,6 +140,20 @@ async def test_agent_task_tracker_repository_crud_operations(postgres_url):
         assert "not found" in str(e)
         print("✅ Invalid event ID correctly rejected")
 
+    # Rejected updates match no row, so nothing was written
+    unchanged_tracker = await tracker_repo.get(id=tracker_id)
+    assert unchanged_tracker.status == "completed"
+    assert unchanged_tracker.status_reason == "All events processed"
+    assert unchanged_tracker.last_processed_event_id == event_id_2
+    print("✅ Rejected updates left the tracker unchanged")
+
+    # Updating a tracker that does not exist
+    with pytest.raises(ItemDoesNotExist):
+        await tracker_repo.update_agent_task_tracker(
+            id=orm_id(), status="error", last_processed_event_id=event_id_2
+        )
+    print("✅ Missing tracker correctly rejected")
+
     # Test LIST operation
     all_trackers_final = await tracker_repo.list()
     assert len(all_trackers_final) >= 1
@@ -233,6 +178,6 @@ async def test_agent_task_tracker_repository_crud_operations(postgres_url):
     print("✅ Foreign key relationships verified")
 
     # NOTE: Each repository operation auto-commits (correct for production)
-    # The session-scoped PostgreSQL container provides isolation between test runs
-    print("✅ Test isolation provided by session-scoped PostgreSQL container")
+    # The clean_db fixture (via agent_task_prereqs) truncates the tables at setup
+    print("✅ Test isolation provided by clean_db truncating the tables at setup")
     print("🎉 ALL AGENT TASK TRACKER REPOSITORY TESTS PASSED!")
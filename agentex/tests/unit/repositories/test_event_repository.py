@@ -2,86 +2,24 @@ import asyncio
 
 # Import the repository and entities we need to test
 import pytest
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from src.adapters.orm import BaseORM
 from src.api.schemas.task_messages import TextContent
-from src.domain.entities.agents import ACPType, AgentEntity, AgentStatus
 from src.domain.entities.task_messages import (
     MessageAuthor,
     MessageStyle,
     TaskMessageContentType,
     TextFormat,
 )
-from src.domain.entities.tasks import TaskEntity, TaskStatus
-from src.domain.repositories.agent_repository import AgentRepository
-from src.domain.repositories.event_repository import EventRepository
-from src.domain.repositories.task_repository import TaskRepository
 from src.utils.ids import orm_id
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.unit
-async def test_event_repository_crud_operations(postgres_url):
+async def test_event_repository_crud_operations(agent_task_prereqs):
     """Test EventRepository CRUD operations with foreign key relationships and complex querying"""
 
-    # URL conversion for SQLAlchemy async
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
-    )
-
-    # Wait for database readiness
-    for attempt in range(10):
-        try:
-            engine = create_async_engine(sqlalchemy_asyncpg_url, echo=True)
-            async with engine.begin() as conn:
-                # Create all tables
-                await conn.run_sync(BaseORM.metadata.create_all)
-                # Test connectivity
-                await conn.execute(text("SELECT 1"))
-            break
-        except Exception as e:
-            if attempt < 9:
-                print(
-                    f"Database not ready (attempt {attempt + 1}), retrying... Error: {e}"
-                )
-                await asyncio.sleep(2)
-                continue
-            raise
-
-    # Create async session maker
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-
-    # Create repositories
-    event_repo = EventRepository(async_session_maker, async_session_maker)
-    agent_repo = AgentRepository(async_session_maker, async_session_maker)
-    task_repo = TaskRepository(async_session_maker, async_session_maker)
-
-    # First, create prerequisites: Agent and Task
-    agent_id = orm_id()
-    agent = AgentEntity(
-        id=agent_id,
-        name="test-agent-for-events",
-        description="Test agent for event repository testing",
-        docker_image="test/agent:latest",
-        status=AgentStatus.READY,
-        acp_url="http://localhost:8000/acp",
-        acp_type=ACPType.ASYNC,
-    )
-
-    created_agent = await agent_repo.create(agent)
-    print(f"✅ Agent created for event testing: {created_agent.id}")
-
-    task_id = orm_id()
-    task = TaskEntity(
-        id=task_id,
-        name="test-task-for-events",
-        status=TaskStatus.RUNNING,
-        status_reason="Task is running for event testing",
-    )
-
-    created_task = await task_repo.create(agent_id, task)
-    print(f"✅ Task created for event testing: {created_task.id}")
+    event_repo = agent_task_prereqs["event_repository"]
+    agent_id = agent_task_prereqs["agent_id"]
+    task_id = agent_task_prereqs["task_id"]
 
     # Test CREATE operation with TextContent
     event_id_1 = orm_id()
@@ -110,51 +48,86 @@ async def test_event_repository_crud_operations(postgres_url):
     assert created_event_1.created_at is not None
     print("✅ CREATE operation successful (with TextContent)")
 
-    # Test CREATE operation without content
+    # Test CREATE_MANY operation, with and without content, in one batch
     event_id_2 = orm_id()
-    created_event_2 = await event_repo.create(
-        id=event_id_2, task_id=task_id, agent_id=agent_id, content=None
+    event_id_3 = orm_id()
+    created_event_2, created_event_3 = await event_repo.create_many(
+        task_id=task_id,
+        agent_id=agent_id,
+        events=[
+            (event_id_2, None),
+            (
+                event_id_3,
+                TextContent(
+                    type=TaskMessageContentType.TEXT,
+                    author=MessageAuthor.USER,
+                    content="Third event for sequence testing",
+                ),
+            ),
+        ],
     )
 
     assert created_event_2.id == event_id_2
     assert created_event_2.content is None
     assert created_event_2.sequence_id > created_event_1.sequence_id  # Should increment
-    print("✅ CREATE operation successful (without content)")
+    assert created_event_3.id == event_id_3
+    assert created_event_3.content.content == "Third event for sequence testing"
+    assert created_event_3.sequence_id > created_event_2.sequence_id  # Batch order
+    print("✅ CREATE_MANY operation successful (with and without content)")
+
+    # GET and LIST are independent reads, so issue them concurrently
+    retrieved_event, all_events = await asyncio.gather(
+        event_repo.get(id=event_id_1), event_repo.list()
+    )
 
     # Test GET operation by ID
-    retrieved_event = await event_repo.get(id=event_id_1)
     assert retrieved_event.id == created_event_1.id
     assert retrieved_event.sequence_id == created_event_1.sequence_id
     assert retrieved_event.content.content == text_content.content
     print("✅ GET by ID operation successful")
 
     # Test LIST operation
-    all_events = await event_repo.list()
-    assert len(all_events) >= 2
+    assert len(all_events) >= 3
     event_ids = [e.id for e in all_events]
     assert event_id_1 in event_ids
     assert event_id_2 in event_ids
+    assert event_id_3 in event_ids
     print("✅ LIST operation successful")
 
-    # Create a third event to test complex querying
-    event_id_3 = orm_id()
-    await event_repo.create(
-        id=event_id_3,
-        task_id=task_id,
-        agent_id=agent_id,
-        content=TextContent(
-            type=TaskMessageContentType.TEXT,
-            author=MessageAuthor.USER,
-            content="Third event for sequence testing",
+    # Test complex querying: list_events_after_last_processed
+    # The cursor queries are independent reads, so issue them concurrently
+    (
+        all_task_events,
+        events_after_first,
+        events_after_first_sequence,
+        events_after_unknown,
+        events_with_limit,
+        events_after_with_limit,
+    ) = await asyncio.gather(
+        event_repo.list_events_after_last_processed(task_id=task_id, agent_id=agent_id),
+        event_repo.list_events_after_last_processed(
+            task_id=task_id, agent_id=agent_id, last_processed_event_id=event_id_1
+        ),
+        event_repo.list_events_after_last_processed(
+            task_id=task_id,
+            agent_id=agent_id,
+            last_sequence_id=created_event_1.sequence_id,
+        ),
+        event_repo.list_events_after_last_processed(
+            task_id=task_id, agent_id=agent_id, last_processed_event_id=orm_id()
+        ),
+        event_repo.list_events_after_last_processed(
+            task_id=task_id, agent_id=agent_id, limit=2
+        ),
+        event_repo.list_events_after_last_processed(
+            task_id=task_id,
+            agent_id=agent_id,
+            last_processed_event_id=event_id_1,
+            limit=1,
         ),
     )
-    print("✅ Third event created for sequence testing")
 
-    # Test complex querying: list_events_after_last_processed
     # Get all events (no last_processed_event_id)
-    all_task_events = await event_repo.list_events_after_last_processed(
-        task_id=task_id, agent_id=agent_id
-    )
     assert len(all_task_events) == 3
     # Should be ordered by sequence_id
     assert (
@@ -165,27 +138,26 @@ async def test_event_repository_crud_operations(postgres_url):
     print("✅ Complex query: all events successful")
 
     # Test filtering after a specific event
-    events_after_first = await event_repo.list_events_after_last_processed(
-        task_id=task_id, agent_id=agent_id, last_processed_event_id=event_id_1
-    )
     assert len(events_after_first) == 2
     assert events_after_first[0].id == event_id_2
     assert events_after_first[1].id == event_id_3
     print("✅ Complex query: events after first successful")
 
+    # Test keyset filtering directly on the sequence ID of the first event
+    assert [e.id for e in events_after_first_sequence] == [event_id_2, event_id_3]
+    print("✅ Complex query: events after first sequence ID successful")
+
+    # An unknown event ID leaves the cursor filter off
+    assert len(events_after_unknown) == 3
+    print("✅ Complex query: unknown last processed event ignored")
+
     # Test filtering with limit
-    events_with_limit = await event_repo.list_events_after_last_processed(
-        task_id=task_id, agent_id=agent_id, limit=2
-    )
     assert len(events_with_limit) == 2
     assert events_with_limit[0].id == event_id_1  # First in sequence
     assert events_with_limit[1].id == event_id_2  # Second in sequence
     print("✅ Complex query: events with limit successful")
 
     # Test filtering with both last_processed_event_id and limit
-    events_after_with_limit = await event_repo.list_events_after_last_processed(
-        task_id=task_id, agent_id=agent_id, last_processed_event_id=event_id_1, limit=1
-    )
     assert len(events_after_with_limit) == 1
     assert events_after_with_limit[0].id == event_id_2
     print("✅ Complex query: events after with limit successful")
@@ -193,18 +165,17 @@ async def test_event_repository_crud_operations(postgres_url):
     # Test DELETE operation (inherited from base)
     await event_repo.delete(event_id_3)
 
-    # Verify deletion
-    all_events_after_delete = await event_repo.list()
-    event_ids_after_delete = [e.id for e in all_events_after_delete]
-    assert event_id_3 not in event_ids_after_delete
-    assert event_id_1 in event_ids_after_delete  # Should still exist
-    assert event_id_2 in event_ids_after_delete  # Should still exist
+    # Verify deletion, and the complex query after it, with concurrent reads
+    event_3_exists, remaining_event_ids, remaining_events = await asyncio.gather(
+        event_repo.exists(event_id_3),
+        event_repo.exists_many([event_id_1, event_id_2, event_id_3]),
+        event_repo.list_events_after_last_processed(task_id=task_id, agent_id=agent_id),
+    )
+    assert not event_3_exists
+    assert remaining_event_ids == {event_id_1, event_id_2}  # Should still exist
     print("✅ DELETE operation successful")
 
     # Verify complex query still works after deletion
-    remaining_events = await event_repo.list_events_after_last_processed(
-        task_id=task_id, agent_id=agent_id
-    )
     assert len(remaining_events) == 2
     assert remaining_events[0].id == event_id_1
     assert remaining_events[1].id == event_id_2
@@ -217,6 +188,6 @@ async def test_event_repository_crud_operations(postgres_url):
     print("✅ Foreign key relationships verified")
 
     # NOTE: Each repository operation auto-commits (correct for production)
-    # The session-scoped PostgreSQL container provides isolation between test runs
-    print("✅ Test isolation provided by session-scoped PostgreSQL container")
+    # The clean_db fixture (via agent_task_prereqs) truncates the tables at setup
+    print("✅ Test isolation provided by clean_db truncating the tables at setup")
     print("🎉 ALL EVENT REPOSITORY TESTS PASSED!")
@@ -1,58 +1,45 @@
-import asyncio
-import os
-
 # Import the repository and entities we need to test
-import sys
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 import pytest
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
-
-from adapters.orm import BaseORM, TaskORM
-from domain.entities.spans import SpanEntity
-from domain.repositories.span_repository import SpanRepository
-from utils.ids import orm_id
+from sqlalchemy import select, text
+from src.adapters.orm import SpanORM, TaskORM
+from src.domain.entities.spans import SpanEntity
+from src.domain.repositories.span_repository import SpanRepository
+from src.utils.ids import orm_id
+
+# Fixed start time for tests that never compare against the wall clock; offsets
+# from it give a deterministic start_time order where one is asserted
+_START_TIME = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+async def list_trace_span_ids_ordered(
+    session_maker, trace_id: str, limit: int = 100
+) -> list[tuple[str, datetime]]:
+    """
+    (id, start_time) for the spans of one trace ordered by start_time, without
+    loading or decoding the JSON input, output and data columns.
+    """
+    async with session_maker() as session:
+        result = await session.execute(
+            select(SpanORM.id, SpanORM.start_time)
+            .where(SpanORM.trace_id == trace_id)
+            .order_by(SpanORM.start_time)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result]
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.unit
-async def test_span_repository_crud_operations(postgres_url):
+async def test_span_repository_crud_operations(
+    agent_task_prereqs, shared_session_maker
+):
     """Test SpanRepository CRUD operations with JSON fields and time ordering"""
 
-    # URL conversion for SQLAlchemy async
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
-    )
-
-    # Wait for database readiness
-    for attempt in range(10):
-        try:
-            engine = create_async_engine(sqlalchemy_asyncpg_url, echo=True)
-            async with engine.begin() as conn:
-                await conn.run_sync(BaseORM.metadata.create_all)
-                await conn.execute(text("SELECT 1"))
-            break
-        except Exception as e:
-            if attempt < 9:
-                print(
-                    f"Database not ready (attempt {attempt + 1}), retrying... Error: {e}"
-                )
-                await asyncio.sleep(2)
-                continue
-            raise
-
-    # Create async session maker and repository
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-    span_repo = SpanRepository(async_session_maker, async_session_maker)
-
-    # Create a task row to satisfy the FK constraint on spans.task_id
-    task_id = orm_id()
-    async with async_session_maker() as session:
-        session.add(TaskORM(id=task_id, name="test-task"))
-        await session.commit()
+    span_repo = agent_task_prereqs["span_repository"]
+    # The fixture's task satisfies the FK constraint on spans.task_id
+    task_id = agent_task_prereqs["task_id"]
 
     # Test CREATE operation with JSON fields
     now = datetime.now(UTC)
@@ -130,16 +117,18 @@ async def test_span_repository_crud_operations(postgres_url):
     await span_repo.create(child_span)
     print("✅ Child span created for ordering test")
 
-    # Test LIST operation with time-based ordering
-    all_spans = await span_repo.list()
-    assert len(all_spans) >= 2
-    span_ids = [s.id for s in all_spans]
+    # Test time-based ordering on IDs and start times only
+    ordered_spans = await list_trace_span_ids_ordered(shared_session_maker, trace_id)
+    assert len(ordered_spans) == 2
+    span_ids = [id for id, _ in ordered_spans]
     assert span_id in span_ids
     assert child_span_id in span_ids
+    start_times = [start_time for _, start_time in ordered_spans]
+    assert start_times == sorted(start_times)
 
     # Should be ordered by start_time (parent should come first)
-    parent_index = next(i for i, s in enumerate(all_spans) if s.id == span_id)
-    child_index = next(i for i, s in enumerate(all_spans) if s.id == child_span_id)
+    parent_index = span_ids.index(span_id)
+    child_index = span_ids.index(child_span_id)
     assert parent_index < child_index, "Parent span should come before child span"
     print("✅ LIST operation successful with time ordering")
 
@@ -153,30 +142,81 @@ async def test_span_repository_crud_operations(postgres_url):
     assert span_id in span_ids_after_delete
     print("✅ DELETE operation successful")
 
-    print("✅ Test isolation provided by session-scoped PostgreSQL container")
+    print("✅ Test isolation provided by clean_db truncating the tables at setup")
     print("🎉 ALL SPAN REPOSITORY TESTS PASSED!")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.unit
-async def test_span_task_id_set_null_on_task_delete(postgres_url):
-    """Deleting a referenced task should null out spans.task_id, not fail with FK violation."""
+async def test_span_repository_create_many(agent_task_prereqs, shared_session_maker):
+    """
+    Bulk-created spans should round-trip their JSON fields, and store None JSON
+    fields as JSON 'null' the way create() does.
+    """
+
+    span_repo = agent_task_prereqs["span_repository"]
+    task_id = agent_task_prereqs["task_id"]
+    trace_id = orm_id()
 
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
+    spans = [
+        SpanEntity(
+            id=orm_id(),
+            trace_id=trace_id,
+            task_id=task_id,
+            parent_id=None,
+            name=f"bulk-span-{i}",
+            start_time=_START_TIME + timedelta(seconds=i),
+            input={"index": i, "nested": {"items": [1, 2, 3]}},
+            output=[{"result": "ok"}] if i % 2 else None,
+            data=None,
+        )
+        for i in range(5)
+    ]
+
+    created = await span_repo.create_many(spans)
+    assert [s.id for s in created] == [s.id for s in spans]
+    assert await span_repo.create_many([]) == []
+
+    retrieved = await span_repo.list(filters={"trace_id": trace_id})
+    assert [s.id for s in retrieved] == [s.id for s in spans]
+    for original, stored in zip(spans, retrieved, strict=True):
+        assert stored.task_id == task_id
+        assert stored.input == original.input
+        assert stored.output == original.output
+        assert stored.data is None
+        assert stored.end_time is None
+
+    single = await span_repo.create(
+        SpanEntity(
+            id=orm_id(),
+            trace_id=orm_id(),
+            task_id=task_id,
+            name="single-span",
+            start_time=_START_TIME,
+        )
     )
+    async with shared_session_maker() as session:
+        stored_types = await session.execute(
+            text(
+                "SELECT json_typeof(output), json_typeof(data) FROM spans"
+                " WHERE id IN (:bulk, :single)"
+            ),
+            {"bulk": spans[0].id, "single": single.id},
+        )
+        assert list(stored_types) == [("null", "null"), ("null", "null")]
 
-    engine = create_async_engine(sqlalchemy_asyncpg_url, echo=False)
-    async with engine.begin() as conn:
-        await conn.run_sync(BaseORM.metadata.create_all)
 
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-    span_repo = SpanRepository(async_session_maker, async_session_maker)
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.unit
+async def test_span_task_id_set_null_on_task_delete(rollback_session_maker):
+    """Deleting a referenced task should null out spans.task_id, not fail with FK violation."""
+
+    span_repo = SpanRepository(rollback_session_maker, rollback_session_maker)
 
     # Seed a task and a span referencing it
     task_id = orm_id()
     span_id = orm_id()
-    async with async_session_maker() as session:
+    async with rollback_session_maker() as session:
         session.add(TaskORM(id=task_id, name="task-to-delete"))
         await session.commit()
 
@@ -187,12 +227,12 @@ async def test_span_task_id_set_null_on_task_delete(postgres_url):
             task_id=task_id,
             parent_id=None,
             name="span-with-task-fk",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
     # Delete the task — should succeed, not raise a FK violation
-    async with async_session_maker() as session:
+    async with rollback_session_maker() as session:
         task = await session.get(TaskORM, task_id)
         await session.delete(task)
         await session.commit()
@@ -203,27 +243,14 @@ async def test_span_task_id_set_null_on_task_delete(postgres_url):
     assert retrieved.task_id is None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.unit
-async def test_list_by_task_id_falls_back_to_trace_id(postgres_url):
+async def test_list_by_task_id_falls_back_to_trace_id(agent_task_prereqs):
     """Listing by task_id should also match historical rows that have the value
     in trace_id but a NULL task_id (pre-backfill state)."""
 
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
-    )
-
-    engine = create_async_engine(sqlalchemy_asyncpg_url, echo=False)
-    async with engine.begin() as conn:
-        await conn.run_sync(BaseORM.metadata.create_all)
-
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-    span_repo = SpanRepository(async_session_maker, async_session_maker)
-
-    task_id = orm_id()
-    async with async_session_maker() as session:
-        session.add(TaskORM(id=task_id, name="task-or-fallback"))
-        await session.commit()
+    span_repo = agent_task_prereqs["span_repository"]
+    task_id = agent_task_prereqs["task_id"]
 
     # Historical span: task_id NULL, trace_id holds the task id (pre-backfill)
     historical_id = orm_id()
@@ -234,7 +261,7 @@ async def test_list_by_task_id_falls_back_to_trace_id(postgres_url):
             task_id=None,
             parent_id=None,
             name="historical",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
@@ -247,7 +274,7 @@ async def test_list_by_task_id_falls_back_to_trace_id(postgres_url):
             task_id=task_id,
             parent_id=None,
             name="new-style",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
@@ -260,7 +287,7 @@ async def test_list_by_task_id_falls_back_to_trace_id(postgres_url):
             task_id=None,
             parent_id=None,
             name="unrelated",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
@@ -271,23 +298,14 @@ async def test_list_by_task_id_falls_back_to_trace_id(postgres_url):
     assert unrelated_id not in matched_ids
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.unit
-async def test_list_with_none_task_id_does_not_or_on_trace_id(postgres_url):
+async def test_list_with_none_task_id_does_not_or_on_trace_id(agent_task_prereqs):
     """A None task_id filter must NOT trigger the trace_id OR fallback,
     otherwise the predicate expands to (task_id IS NULL OR trace_id IS NULL)
     and returns nearly every row on a partially backfilled table."""
 
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
-    )
-
-    engine = create_async_engine(sqlalchemy_asyncpg_url, echo=False)
-    async with engine.begin() as conn:
-        await conn.run_sync(BaseORM.metadata.create_all)
-
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-    span_repo = SpanRepository(async_session_maker, async_session_maker)
+    span_repo = agent_task_prereqs["span_repository"]
 
     # Span with non-null trace_id and null task_id (pre-backfill historical row).
     # If the OR fallback were applied to a None task_id filter, this row would
@@ -305,7 +323,7 @@ async def test_list_with_none_task_id_does_not_or_on_trace_id(postgres_url):
             task_id=None,
             parent_id=None,
             name="historical-null-task",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
@@ -313,10 +331,7 @@ async def test_list_with_none_task_id_does_not_or_on_trace_id(postgres_url):
     # match a "task_id IS NULL" filter under either correct or incorrect
     # behavior — included as a sanity check.
     populated_id = orm_id()
-    task_id = orm_id()
-    async with async_session_maker() as session:
-        session.add(TaskORM(id=task_id, name="task-for-populated-span"))
-        await session.commit()
+    task_id = agent_task_prereqs["task_id"]
     await span_repo.create(
         SpanEntity(
             id=populated_id,
@@ -324,7 +339,7 @@ async def test_list_with_none_task_id_does_not_or_on_trace_id(postgres_url):
             task_id=task_id,
             parent_id=None,
             name="populated",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
@@ -336,28 +351,16 @@ async def test_list_with_none_task_id_does_not_or_on_trace_id(postgres_url):
     assert populated_id not in matched_ids
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.unit
-async def test_list_combines_task_id_and_trace_id_filters(postgres_url):
+async def test_list_combines_task_id_and_trace_id_filters(agent_task_prereqs):
     """When both task_id and trace_id are passed, the trace_id filter still
     applies on top of the task_id OR-fallback (logical AND between filters)."""
 
-    sqlalchemy_asyncpg_url = postgres_url.replace(
-        "postgresql+psycopg2://", "postgresql+asyncpg://"
-    )
+    span_repo = agent_task_prereqs["span_repository"]
 
-    engine = create_async_engine(sqlalchemy_asyncpg_url, echo=False)
-    async with engine.begin() as conn:
-        await conn.run_sync(BaseORM.metadata.create_all)
-
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-    span_repo = SpanRepository(async_session_maker, async_session_maker)
-
-    task_id = orm_id()
+    task_id = agent_task_prereqs["task_id"]
     other_trace_id = orm_id()
-    async with async_session_maker() as session:
-        session.add(TaskORM(id=task_id, name="task-and"))
-        await session.commit()
 
     # Span matches task_id but not the requested trace_id — should be excluded
     excluded_id = orm_id()
@@ -368,7 +371,7 @@ async def test_list_combines_task_id_and_trace_id_filters(postgres_url):
             task_id=task_id,
             parent_id=None,
             name="excluded",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
@@ -381,7 +384,7 @@ async def test_list_combines_task_id_and_trace_id_filters(postgres_url):
             task_id=task_id,
             parent_id=None,
             name="included",
-            start_time=datetime.now(UTC),
+            start_time=_START_TIME,
         )
     )
 
@@ -16,7 +16,6 @@ from src.domain.entities.task_messages import (
 from src.utils.ids import orm_id
 
 
-@pytest.mark.asyncio
 @pytest.mark.unit
 async def test_task_message_repository_crud_operations(task_message_repository):
     """Test task message repository CRUD operations using a real database"""
@@ -110,7 +109,6 @@ async def test_task_message_repository_crud_operations(task_message_repository):
         pass  # This is expected
 
 
-@pytest.mark.asyncio
 @pytest.mark.unit
 async def test_task_message_repository_with_data_content(task_message_repository):
     """Test task message repository with data content"""
@@ -151,7 +149,6 @@ async def test_task_message_repository_with_data_content(task_message_repository
     await repo.delete(id=created_message.id)
 
 
-@pytest.mark.asyncio
 @pytest.mark.unit
 async def test_task_message_repository_list_by_task_id_pagination(
     task_message_repository,
@@ -161,36 +158,33 @@ async def test_task_message_repository_list_by_task_id_pagination(
 
     task_id = orm_id()
 
-    # Create multiple task messages
-    created_ids = []
-    for i in range(5):
-        text_content = TextContentEntity(
-            type=TaskMessageContentType.TEXT,
-            content=f"Message {i}",
-            author=MessageAuthor.USER,
-            style=MessageStyle.STATIC,
-            format=TextFormat.PLAIN,
-        )
-
-        task_message = TaskMessageEntity(
-            task_id=task_id,
-            content=text_content,
-            streaming_status="DONE",
-        )
-
-        created_message = await repo.create(task_message)
-        created_ids.append(created_message.id)
+    # Create multiple task messages in one insert_many round-trip
+    created_messages = await repo.batch_create(
+        [
+            TaskMessageEntity(
+                task_id=task_id,
+                content=TextContentEntity(
+                    type=TaskMessageContentType.TEXT,
+                    content=f"Message {i}",
+                    author=MessageAuthor.USER,
+                    style=MessageStyle.STATIC,
+                    format=TextFormat.PLAIN,
+                ),
+                streaming_status="DONE",
+            )
+            for i in range(5)
+        ]
+    )
+    created_ids = [message.id for message in created_messages]
 
     # Test pagination - MongoDB repository doesn't have pagination, so just test finding all
     all_messages = await repo.find_by_field(field_name="task_id", field_value=task_id)
     assert len(all_messages) == 5
 
-    # Cleanup
-    for message_id in created_ids:
-        await repo.delete(id=message_id)
+    # Cleanup in one delete_many round-trip
+    await repo.batch_delete(ids=created_ids)
 
 
-@pytest.mark.asyncio
 @pytest.mark.unit
 async def test_create_preserves_caller_supplied_timestamps(
     task_message_repository,
@@ -233,7 +227,6 @@ async def test_create_preserves_caller_supplied_timestamps(
     await repo.delete(id=created.id)
 
 
-@pytest.mark.asyncio
 @pytest.mark.unit
 async def test_batch_create_preserves_per_item_timestamps(
     task_message_repository,
@@ -1,15 +1,8 @@
-import os
-
 # Import the repository and entities we need to test
-import sys
-
 import pytest
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
-
-from domain.entities.states import StateEntity
-from domain.repositories.task_state_repository import TaskStateRepository
-from utils.ids import orm_id
+from src.domain.entities.states import StateEntity
+from src.domain.repositories.task_state_repository import TaskStateRepository
+from src.utils.ids import orm_id
 
 
 @pytest.mark.asyncio
@@ -33,6 +33,7 @@ def _service(principal_context, gateway):
         AgentexResource.api_key("api-key-1"),
         AgentexResource.schedule("agent-1/schedule-1"),
     ],
+    ids=["agent", "task", "api_key", "schedule"],
 )
 async def test_authorization_checks_call_gateway_each_time(resource):
     gateway = AsyncMock()
@@ -5,26 +5,36 @@ from unittest.mock import AsyncMock
 import pytest
 from src.domain.entities.tasks import TaskStatus
 from src.domain.exceptions import ClientError
+from src.domain.repositories.agent_task_tracker_repository import (
+    AgentTaskTrackerRepository,
+)
+from src.domain.repositories.event_repository import EventRepository
+from src.domain.repositories.task_message_repository import TaskMessageRepository
+from src.domain.repositories.task_repository import TaskRepository
+from src.domain.repositories.task_state_repository import TaskStateRepositoryProtocol
+from src.domain.services.task_message_service import TaskMessageService
 from src.domain.services.task_retention_service import TaskRetentionService
 
 
 def _make_service(task, *, messages=None):
-    task_repository = AsyncMock()
+    # Specced mocks reject attributes the real collaborators do not have, so a
+    # renamed repository method fails here instead of passing silently
+    task_repository = AsyncMock(spec=TaskRepository)
     task_repository.get.return_value = task
-    task_message_service = AsyncMock()
+    task_message_service = AsyncMock(spec=TaskMessageService)
     task_message_service.get_messages.return_value = messages or []
     task_message_service.delete_all_messages.return_value = 0
-    task_state_repository = AsyncMock()
+    task_state_repository = AsyncMock(spec=TaskStateRepositoryProtocol)
     task_state_repository.delete_by_field.return_value = 0
-    event_repository = AsyncMock()
+    event_repository = AsyncMock(spec=EventRepository)
     event_repository.delete_by_task_id.return_value = 0
-    agent_task_tracker_repository = AsyncMock()
+    agent_task_tracker_repository = AsyncMock(spec=AgentTaskTrackerRepository)
     agent_task_tracker_repository.find_by_field.return_value = []
 
     return TaskRetentionService(
         task_repository=task_repository,
         task_message_service=task_message_service,
-        task_message_repository=AsyncMock(),
+        task_message_repository=AsyncMock(spec=TaskMessageRepository),
         task_state_repository=task_state_repository,
         event_repository=event_repository,
         agent_task_tracker_repository=agent_task_tracker_repository,
@@ -33,43 +43,26 @@ def _make_service(task, *, messages=None):
     )
 
 
-def _running_task(idle_for_days: int):
+def _idle_task(status: TaskStatus, idle_for_days: int):
     return SimpleNamespace(
         id="t1",
         cleaned_at=None,
-        status=TaskStatus.RUNNING,
+        status=status,
         updated_at=datetime.now(UTC) - timedelta(days=idle_for_days),
     )
 
 
+def _running_task(idle_for_days: int):
+    return _idle_task(TaskStatus.RUNNING, idle_for_days)
+
+
+def _completed_task(idle_for_days: int):
+    return _idle_task(TaskStatus.COMPLETED, idle_for_days)
+
+
 @pytest.mark.unit
-@pytest.mark.asyncio
 async def test_preview_clean_task_validates_without_writes():
-    task_repository = AsyncMock()
-    task_repository.get.return_value = SimpleNamespace(
-        id="t1",
-        cleaned_at=None,
-        status=TaskStatus.COMPLETED,
-        updated_at=datetime.now(UTC) - timedelta(days=30),
-    )
-    task_message_service = AsyncMock()
-    task_message_service.get_messages.return_value = []
-    task_message_repository = AsyncMock()
-    task_state_repository = AsyncMock()
-    event_repository = AsyncMock()
-    agent_task_tracker_repository = AsyncMock()
-    agent_task_tracker_repository.find_by_field.return_value = []
-
-    service = TaskRetentionService(
-        task_repository=task_repository,
-        task_message_service=task_message_service,
-        task_message_repository=task_message_repository,
-        task_state_repository=task_state_repository,
-        event_repository=event_repository,
-        agent_task_tracker_repository=agent_task_tracker_repository,
-        temporal_adapter=AsyncMock(),
-        httpx_client=AsyncMock(),
-    )
+    service = _make_service(_completed_task(idle_for_days=30))
 
     result = await service.preview_clean_task(task_id="t1", idle_days=7)
 
@@ -77,24 +70,45 @@ async def test_preview_clean_task_validates_without_writes():
     assert result.messages_deleted == 0
     assert result.task_states_deleted == 0
     assert result.events_deleted == 0
-    task_message_service.delete_all_messages.assert_not_awaited()
-    task_state_repository.delete_by_field.assert_not_awaited()
-    event_repository.delete_by_task_id.assert_not_awaited()
-    agent_task_tracker_repository.reset_cursors_for_task.assert_not_awaited()
-    task_repository.update.assert_not_awaited()
+    service.task_message_service.delete_all_messages.assert_not_awaited()
+    service.task_state_repository.delete_by_field.assert_not_awaited()
+    service.event_repository.delete_by_task_id.assert_not_awaited()
+    service.agent_task_tracker_repository.reset_cursors_for_task.assert_not_awaited()
+    service.task_repository.update.assert_not_awaited()
+
+
+# RUNNING-guard refusals: (idle days, stale-RUNNING threshold, message ages)
+_RUNNING_REFUSALS = [
+    # No stale override (0 is the default)
+    pytest.param(90, 0, [], id="by_default"),
+    # Past idle_days (7) but short of the stale-RUNNING threshold (30)
+    pytest.param(10, 30, [], id="not_stale_enough"),
+    # Postgres row is stale but a recent Mongo message proves interaction:
+    # last-interaction = max(updated_at, latest message), so no override.
+    pytest.param(90, 30, [1], id="recent_messages"),
+]
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
-async def test_clean_task_refuses_running_task_by_default():
-    service = _make_service(_running_task(idle_for_days=90))
+@pytest.mark.parametrize(
+    "idle_for_days,stale_running_days,message_ages_days", _RUNNING_REFUSALS
+)
+async def test_clean_task_refuses_running_task(
+    idle_for_days, stale_running_days, message_ages_days
+):
+    messages = [
+        SimpleNamespace(created_at=datetime.now(UTC) - timedelta(days=age))
+        for age in message_ages_days
+    ]
+    service = _make_service(_running_task(idle_for_days), messages=messages)
 
     with pytest.raises(ClientError, match="RUNNING"):
-        await service.clean_task(task_id="t1", idle_days=7)
+        await service.clean_task(
+            task_id="t1", idle_days=7, stale_running_days=stale_running_days
+        )
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
 async def test_clean_task_cleans_stale_running_task_with_override():
     service = _make_service(_running_task(idle_for_days=90))
 
@@ -106,30 +120,6 @@ async def test_clean_task_cleans_stale_running_task_with_override():
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
-async def test_clean_task_refuses_running_task_not_stale_enough():
-    # RUNNING and idle 10 days: past idle_days (7) but short of the
-    # stale-RUNNING threshold (30) — must still be refused.
-    service = _make_service(_running_task(idle_for_days=10))
-
-    with pytest.raises(ClientError, match="RUNNING"):
-        await service.clean_task(task_id="t1", idle_days=7, stale_running_days=30)
-
-
-@pytest.mark.unit
-@pytest.mark.asyncio
-async def test_clean_task_running_override_respects_recent_messages():
-    # Postgres row is stale but a recent Mongo message proves interaction:
-    # last-interaction = max(updated_at, latest message), so no override.
-    recent_message = SimpleNamespace(created_at=datetime.now(UTC) - timedelta(days=1))
-    service = _make_service(_running_task(idle_for_days=90), messages=[recent_message])
-
-    with pytest.raises(ClientError, match="RUNNING"):
-        await service.clean_task(task_id="t1", idle_days=7, stale_running_days=30)
-
-
-@pytest.mark.unit
-@pytest.mark.asyncio
 async def test_preview_clean_task_applies_stale_running_override():
     service = _make_service(_running_task(idle_for_days=90))
 
@@ -142,15 +132,6 @@ async def test_preview_clean_task_applies_stale_running_override():
     service.task_repository.update.assert_not_awaited()
 
 
-def _completed_task(idle_for_days: int):
-    return SimpleNamespace(
-        id="t1",
-        cleaned_at=None,
-        status=TaskStatus.COMPLETED,
-        updated_at=datetime.now(UTC) - timedelta(days=idle_for_days),
-    )
-
-
 def _wire_unprocessed_events(service):
     # One tracker with a stalled (NULL) cursor and an event past it: the
     # shape signal-driven agents (e.g. One Edge) leave behind, since they
@@ -164,33 +145,32 @@ def _wire_unprocessed_events(service):
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
-async def test_clean_task_refuses_unprocessed_events_by_default():
-    # Idle, terminal task (passes running + idle guards) but with events past
-    # the cursor and no stale override: must still refuse.
+@pytest.mark.parametrize(
+    "stale_running_days",
+    [
+        # Idle, terminal task (passes running + idle guards) but with events
+        # past the cursor and no stale override: must still refuse.
+        pytest.param(0, id="by_default"),
+        # Even with the stale override enabled: the unprocessed-events
+        # relaxation is scoped to the stuck-RUNNING case, so a terminal task
+        # with a lagging cursor must still refuse rather than delete genuinely
+        # pending events.
+        pytest.param(30, id="terminal_with_stale_override"),
+    ],
+)
+async def test_clean_task_refuses_unprocessed_events_for_terminal_task(
+    stale_running_days,
+):
     service = _make_service(_completed_task(idle_for_days=90))
     _wire_unprocessed_events(service)
 
     with pytest.raises(ClientError, match="unprocessed events"):
-        await service.clean_task(task_id="t1", idle_days=7)
-
-
-@pytest.mark.unit
-@pytest.mark.asyncio
-async def test_clean_task_terminal_stale_task_keeps_strict_unprocessed_guard():
-    # TERMINAL + idle 90d + trailing unprocessed events, even with the stale
-    # override enabled: the unprocessed-events relaxation is scoped to the
-    # stuck-RUNNING case, so a terminal task with a lagging cursor must still
-    # refuse rather than delete genuinely pending events.
-    service = _make_service(_completed_task(idle_for_days=90))
-    _wire_unprocessed_events(service)
-
-    with pytest.raises(ClientError, match="unprocessed events"):
-        await service.clean_task(task_id="t1", idle_days=7, stale_running_days=30)
+        await service.clean_task(
+            task_id="t1", idle_days=7, stale_running_days=stale_running_days
+        )
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
 async def test_clean_task_cleans_stale_idle_task_with_unprocessed_events():
     # RUNNING + idle 90d + trailing unprocessed events: with the stale
     # override both guards relax and the task is cleaned (the One Edge case).
@@ -205,7 +185,6 @@ async def test_clean_task_cleans_stale_idle_task_with_unprocessed_events():
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
 async def test_clean_task_unprocessed_events_not_relaxed_when_not_stale_enough():
     # RUNNING + idle 10d, stale threshold 30d: not abandoned yet, so the
     # RUNNING guard fires first (and unprocessed would too). Must refuse.
@@ -217,7 +196,6 @@ async def test_clean_task_unprocessed_events_not_relaxed_when_not_stale_enough()
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
 async def test_preview_does_not_emit_override_forensics(caplog):
     # Dry-run audits must not produce the forensic WARNING a real cleanup does,
     # or alerting keyed on the event name false-positives on every preview.
@@ -234,7 +212,6 @@ async def test_preview_does_not_emit_override_forensics(caplog):
 
 
 @pytest.mark.unit
-@pytest.mark.asyncio
 async def test_clean_emits_override_forensics(caplog):
     service = _make_service(_running_task(idle_for_days=90))
     _wire_unprocessed_events(service)
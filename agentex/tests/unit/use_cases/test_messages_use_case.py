@@ -0,0 +1,68 @@
+import pytest
+from src.domain.entities.task_messages import TaskMessageEntityFilter
+from src.domain.use_cases.messages_use_case import (
+    _flatten_to_dot_notation,
+    convert_filters_to_mongodb_query,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "nested,expected",
+    [
+        pytest.param({}, {}, id="empty"),
+        pytest.param({"a": 1, "b": "x"}, {"a": 1, "b": "x"}, id="flat"),
+        pytest.param(
+            {"content": {"type": "text", "author": "user"}},
+            {"content.type": "text", "content.author": "user"},
+            id="nested",
+        ),
+        pytest.param(
+            {"content": {"data": {"meta": {"kind": "x"}}}},
+            {"content.data.meta.kind": "x"},
+            id="deeply_nested",
+        ),
+        pytest.param({"a": {}, "b": 1}, {"b": 1}, id="empty_nested_dict"),
+        pytest.param({"a": [{"b": 1}]}, {"a": [{"b": 1}]}, id="list_is_a_leaf"),
+    ],
+)
+def test_flatten_to_dot_notation(nested, expected):
+    assert _flatten_to_dot_notation(nested) == expected
+
+
+@pytest.mark.unit
+def test_flatten_to_dot_notation_keeps_depth_first_key_order():
+    flattened = _flatten_to_dot_notation(
+        {"a": 1, "b": {"c": 2, "d": {"e": 3}, "f": 4}, "g": 5}
+    )
+
+    assert list(flattened) == ["a", "b.c", "b.d.e", "b.f", "g"]
+
+
+@pytest.mark.unit
+def test_flatten_to_dot_notation_applies_prefix():
+    assert _flatten_to_dot_notation({"type": "text"}, "content") == {
+        "content.type": "text"
+    }
+
+
+@pytest.mark.unit
+def test_convert_filters_to_mongodb_query_combines_include_and_exclude():
+    query = convert_filters_to_mongodb_query(
+        [
+            TaskMessageEntityFilter(streaming_status="DONE"),
+            TaskMessageEntityFilter(streaming_status="IN_PROGRESS", exclude=True),
+        ]
+    )
+
+    assert query == {
+        "$and": [
+            {"$or": [{"streaming_status": "DONE"}]},
+            {"$nor": [{"streaming_status": "IN_PROGRESS"}]},
+        ]
+    }
+
+
+@pytest.mark.unit
+def test_convert_filters_to_mongodb_query_empty():
+    assert convert_filters_to_mongodb_query([]) == {}
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock
+from unittest.mock import NonCallableMagicMock
 
 import pytest
 from src.adapters.crud_store.exceptions import ItemDoesNotExist
@@ -9,10 +9,8 @@ from src.domain.use_cases.states_use_case import StatesUseCase
 
 @pytest.fixture
 def task_state_repository():
-    repository = AsyncMock(spec=TaskStateRepository)
-    repository.get = AsyncMock()
-    repository.update = AsyncMock()
-    return repository
+    # The spec turns every async repository method into an AsyncMock
+    return NonCallableMagicMock(spec=TaskStateRepository)
 
 
 @pytest.fixture
@@ -26,9 +26,9 @@ def test_record_functions_are_noop_when_unconfigured():
         cache_metrics.record_cache_eviction("auth_gateway")
 
 
-@pytest.mark.unit
-def test_record_functions_swallow_emission_errors():
-    # A failing backend must never propagate to the caller (critical auth path).
+@pytest.fixture
+def mock_statsd():
+    """StatsD enabled and OTel counters absent, so emission goes to the mock."""
     with (
         patch.object(cache_metrics, "_STATSD_ENABLED", True),
         patch.object(cache_metrics, "_instruments_initialized", True),
@@ -36,22 +36,22 @@ def test_record_functions_swallow_emission_errors():
         patch.object(cache_metrics, "_eviction_counter", None),
         patch.object(cache_metrics, "statsd") as mock_statsd,
     ):
-        mock_statsd.increment.side_effect = OSError("socket in a bad state")
+        yield mock_statsd
 
-        # Neither call should raise despite the backend blowing up.
-        cache_metrics.record_cache_access("auth_gateway", "hit")
-        cache_metrics.record_cache_eviction("auth_gateway")
+
+@pytest.mark.unit
+def test_record_functions_swallow_emission_errors(mock_statsd):
+    # A failing backend must never propagate to the caller (critical auth path).
+    mock_statsd.increment.side_effect = OSError("socket in a bad state")
+
+    # Neither call should raise despite the backend blowing up.
+    cache_metrics.record_cache_access("auth_gateway", "hit")
+    cache_metrics.record_cache_eviction("auth_gateway")
 
 
 @pytest.mark.unit
-def test_record_cache_access_emits_statsd_when_enabled():
-    with (
-        patch.object(cache_metrics, "_STATSD_ENABLED", True),
-        patch.object(cache_metrics, "_instruments_initialized", True),
-        patch.object(cache_metrics, "_access_counter", None),
-        patch.object(cache_metrics, "statsd") as mock_statsd,
-    ):
-        cache_metrics.record_cache_access("auth_gateway", "miss_absent")
+def test_record_cache_access_emits_statsd_when_enabled(mock_statsd):
+    cache_metrics.record_cache_access("auth_gateway", "miss_absent")
 
     mock_statsd.increment.assert_called_once_with(
         "auth_cache.access",
@@ -60,14 +60,8 @@ def test_record_cache_access_emits_statsd_when_enabled():
 
 
 @pytest.mark.unit
-def test_record_cache_eviction_emits_statsd_when_enabled():
-    with (
-        patch.object(cache_metrics, "_STATSD_ENABLED", True),
-        patch.object(cache_metrics, "_instruments_initialized", True),
-        patch.object(cache_metrics, "_eviction_counter", None),
-        patch.object(cache_metrics, "statsd") as mock_statsd,
-    ):
-        cache_metrics.record_cache_eviction("agent_api_key")
+def test_record_cache_eviction_emits_statsd_when_enabled(mock_statsd):
+    cache_metrics.record_cache_eviction("agent_api_key")
 
     mock_statsd.increment.assert_called_once_with(
         "auth_cache.eviction",
@@ -5,8 +5,6 @@ Tests the BaseModel class's ability to extract both column values and
 loaded relationships from SQLAlchemy ORM objects.
 """
 
-import os
-import sys
 from datetime import UTC, datetime
 
 import pytest
@@ -24,12 +22,9 @@ from sqlalchemy import (
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, relationship, selectinload
-
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
-
-from domain.entities.agents import AgentEntity, AgentStatus
-from domain.entities.tasks import TaskEntity, TaskStatus
-from utils.ids import orm_id
+from src.domain.entities.agents import AgentEntity, AgentStatus
+from src.domain.entities.tasks import TaskEntity, TaskStatus
+from src.utils.ids import orm_id
 
 # Create test-specific ORM models that use JSON instead of JSONB for SQLite compatibility
 TestBaseORM = declarative_base()